@@ -0,0 +1,201 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled versions of the hot indicator kernels (engine='cython')
+
+Same single-pass algorithms as the numba kernels in indicators.py, built
+ahead of time so there is no JIT warm-up and no numba/LLVM runtime:
+
+    python setup.py build_ext --inplace
+"""
+
+import numpy as np
+from cython cimport floating
+from libc.math cimport NAN, fabs, isnan
+
+
+# ==========================================
+# Shared Steps
+# ==========================================
+
+cdef struct Window:
+    double total
+    long nonzero
+    long nans
+
+
+cdef inline void window_add(Window* window, double value, int sign) noexcept nogil:
+    """Add (sign=1) or remove (sign=-1) a value from a running window sum"""
+    if isnan(value):
+        window.nans += sign
+        return
+    if value != 0.0:
+        window.nonzero += sign
+    window.total += sign * value
+    if window.nonzero == 0:
+        window.total = 0.0
+
+
+cdef inline double true_range(const floating[:] high, const floating[:] low, const floating[:] close, Py_ssize_t i) noexcept nogil:
+    """True range of bar i, skipping NaN terms like DataFrame.max(axis=1)"""
+    cdef double result = high[i] - low[i]
+    cdef double high_close, low_close
+    if i == 0:
+        return result
+    high_close = fabs(high[i] - close[i - 1])
+    low_close = fabs(low[i] - close[i - 1])
+    if not isnan(high_close) and (isnan(result) or high_close > result):
+        result = high_close
+    if not isnan(low_close) and (isnan(result) or low_close > result):
+        result = low_close
+    return result
+
+
+cdef inline void gain_loss(const floating[:] close, Py_ssize_t i, double* gain, double* loss) noexcept nogil:
+    """Gain and loss of bar i versus the previous close"""
+    cdef double delta
+    gain[0] = 0.0
+    loss[0] = 0.0
+    if i == 0:
+        return
+    delta = close[i] - close[i - 1]
+    if delta > 0:
+        gain[0] = delta
+    elif delta < 0:
+        loss[0] = -delta
+
+
+cdef inline void directional_movement(const floating[:] high, const floating[:] low, Py_ssize_t i,
+                                      double* plus_dm, double* minus_dm) noexcept nogil:
+    """+DM and -DM of bar i"""
+    cdef double up, down
+    plus_dm[0] = 0.0
+    minus_dm[0] = 0.0
+    if i == 0:
+        return
+    up = high[i] - high[i - 1]
+    down = low[i - 1] - low[i]
+    if up > down and up > 0:
+        plus_dm[0] = up
+    if down > up and down > 0:
+        minus_dm[0] = down
+
+
+cdef inline void ewm_update(double* weighted, double* old_wt, double value, double alpha) noexcept nogil:
+    """Advance one adjust=False EWM state by one bar (pandas NaN handling)"""
+    if isnan(weighted[0]):
+        weighted[0] = value
+        return
+    old_wt[0] *= 1 - alpha
+    if not isnan(value):
+        if weighted[0] != value:
+            weighted[0] = (old_wt[0] * weighted[0] + alpha * value) / (old_wt[0] + alpha)
+        old_wt[0] = 1.0
+
+
+# ==========================================
+# Kernels
+# ==========================================
+
+def rsi(const floating[:] close, int period):
+    """RSI over rolling mean gain / loss in one pass"""
+    cdef Py_ssize_t i, n = close.shape[0]
+    cdef Window gains = Window(0.0, 0, 0)
+    cdef Window losses = Window(0.0, 0, 0)
+    cdef double gain, loss
+    result = np.full(n, np.nan, dtype=np.asarray(close).dtype)
+    cdef floating[:] out = result
+
+    with nogil:
+        for i in range(n):
+            gain_loss(close, i, &gain, &loss)
+            window_add(&gains, gain, 1)
+            window_add(&losses, loss, 1)
+            if i >= period:
+                gain_loss(close, i - period, &gain, &loss)
+                window_add(&gains, gain, -1)
+                window_add(&losses, loss, -1)
+
+            if i >= period - 1:
+                out[i] = 100 - (100 / (1 + (gains.total / period) / (losses.total / period)))
+    return result
+
+
+def atr(const floating[:] high, const floating[:] low, const floating[:] close, int period):
+    """ATR as a rolling mean of true range in one pass"""
+    cdef Py_ssize_t i, n = high.shape[0]
+    cdef Window ranges = Window(0.0, 0, 0)
+    result = np.full(n, np.nan, dtype=np.asarray(high).dtype)
+    cdef floating[:] out = result
+
+    with nogil:
+        for i in range(n):
+            window_add(&ranges, true_range(high, low, close, i), 1)
+            if i >= period:
+                window_add(&ranges, true_range(high, low, close, i - period), -1)
+
+            if i >= period - 1 and ranges.nans == 0:
+                out[i] = ranges.total / period
+    return result
+
+
+def adx(const floating[:] high, const floating[:] low, const floating[:] close, int period):
+    """ADX, +DI and -DI in one pass"""
+    cdef Py_ssize_t i, n = high.shape[0]
+    cdef Window ranges = Window(0.0, 0, 0)
+    cdef Window plus = Window(0.0, 0, 0)
+    cdef Window minus = Window(0.0, 0, 0)
+    cdef Window dx_window = Window(0.0, 0, 0)
+    cdef double plus_dm, minus_dm, atr_value, plus_value, minus_value
+    dtype = np.asarray(high).dtype
+    adx_result = np.full(n, np.nan, dtype=dtype)
+    plus_result = np.full(n, np.nan, dtype=dtype)
+    minus_result = np.full(n, np.nan, dtype=dtype)
+    dx_result = np.full(n, np.nan, dtype=dtype)
+    cdef floating[:] adx_out = adx_result
+    cdef floating[:] plus_di = plus_result
+    cdef floating[:] minus_di = minus_result
+    cdef floating[:] dx = dx_result
+
+    with nogil:
+        for i in range(n):
+            # Rolling true range and directional movement
+            window_add(&ranges, true_range(high, low, close, i), 1)
+            directional_movement(high, low, i, &plus_dm, &minus_dm)
+            window_add(&plus, plus_dm, 1)
+            window_add(&minus, minus_dm, 1)
+            if i >= period:
+                window_add(&ranges, true_range(high, low, close, i - period), -1)
+                directional_movement(high, low, i - period, &plus_dm, &minus_dm)
+                window_add(&plus, plus_dm, -1)
+                window_add(&minus, minus_dm, -1)
+
+            # Directional indicators and DX
+            if i >= period - 1 and ranges.nans == 0:
+                atr_value = ranges.total / period
+                plus_di[i] = 100 * ((plus.total / period) / atr_value)
+                minus_di[i] = 100 * ((minus.total / period) / atr_value)
+                plus_value = plus_di[i]
+                minus_value = minus_di[i]
+                dx[i] = 100 * fabs(plus_value - minus_value) / (plus_value + minus_value)
+
+            # Rolling mean of DX
+            window_add(&dx_window, dx[i], 1)
+            if i >= period:
+                window_add(&dx_window, dx[i - period], -1)
+            if i >= period - 1 and dx_window.nans == 0:
+                adx_out[i] = dx_window.total / period
+    return adx_result, plus_result, minus_result
+
+
+def ewm(const floating[:] values, double alpha):
+    """adjust=False exponential moving average in one pass"""
+    cdef Py_ssize_t i, n = values.shape[0]
+    cdef double weighted = NAN, old_wt = 1.0
+    result = np.empty(n, dtype=np.asarray(values).dtype)
+    cdef floating[:] out = result
+
+    with nogil:
+        for i in range(n):
+            ewm_update(&weighted, &old_wt, values[i], alpha)
+            out[i] = weighted
+    return result
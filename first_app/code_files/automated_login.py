@@ -1,4 +1,3 @@
-from kiteconnect import KiteConnect
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -6,13 +5,22 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from pyotp import TOTP
-import json
+from urllib.parse import urljoin, urlparse, parse_qs
+import requests
+import orjson
+import os
 import time
+try:
+    import fcntl
+except ImportError:  # Windows, persistent Chrome profile is skipped
+    fcntl = None
 from datetime import datetime
 from pathlib import Path
 from first_app.constants import *
+from first_app.code_files.kite_client import create_kite
 # Import your config
 from first_app.zerodha_config import *
 
@@ -29,7 +37,8 @@ class ZerodhaAutoLogin:
                  user_id, 
                  password, 
                  totp_key, 
-                 headless=False):
+                 headless=False,
+                 use_browser=False):
         """
         Initialize ZerodhaAutoLogin
         
@@ -41,20 +50,24 @@ class ZerodhaAutoLogin:
             totp_key (str): TOTP secret key
             token_file (str): Path to save tokens (default: zerodha_tokens.json)
             headless (bool): Run browser in headless mode (default: False)
+            use_browser (bool): Always login through Chrome instead of the web API (default: False)
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.user_id = user_id
         self.password = password
         self.totp_key = totp_key
+        self._totp = TOTP(self.totp_key)
         self.token_file = zerodha_token_file
         self.headless = headless
+        self.use_browser = use_browser
         
-        # Initialize KiteConnect
-        self.kite = KiteConnect(api_key=self.api_key)
+        # Initialize KiteConnect (pooled session, reusable via get_kite_instance)
+        self.kite = create_kite(self.api_key)
         
         # Initialize driver as None
         self.driver = None
+        self._profile_lock = None
         self.request_token = None
         self.access_token = None
     
@@ -65,17 +78,103 @@ class ZerodhaAutoLogin:
             chrome_options.add_argument('--headless')
             chrome_options.add_argument('--disable-gpu')
             chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.add_argument('--disable-background-networking')
+        
+        # Login only needs the form fields, skip images and notifications
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2
+        })
+        # Don't wait for subresources, the form is usable once the DOM is ready
+        chrome_options.page_load_strategy = 'eager'
+        
+        # Reuse a persistent profile so cached scripts and TLS sessions survive between logins
+        if self._lock_profile():
+            chrome_options.add_argument(f'--user-data-dir={chrome_profile_folder}')
+            chrome_options.add_argument('--profile-directory=Default')
         
         self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+            service=Service(self._chromedriver_path()),
             options=chrome_options
         )
+        
+        # Block assets that are not needed for the login flow
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {
+            'urls': ['*.png', '*.jpg', '*.svg', '*.woff*', '*google-analytics*', '*.css']
+        })
+        self.driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+        self.driver.execute_cdp_cmd('Page.setDownloadBehavior', {'behavior': 'deny'})
+        
+        # Forget the previous Kite session so the login page always shows the blank form
+        self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+            'origin': 'https://kite.zerodha.com',
+            'storageTypes': 'cookies,local_storage,session_storage'
+        })
         print("Chrome driver initialized")
     
-    def _generate_totp(self):
-        """Generate TOTP code"""
-        totp_obj = TOTP(self.totp_key)
-        return totp_obj.now()
+    def _lock_profile(self):
+        """
+        Take an exclusive lock on the persistent Chrome profile
+        
+        Chrome can't share a profile between running instances, so a concurrent
+        login falls back to a fresh temporary profile instead.
+        
+        Returns:
+            bool: True if the persistent profile can be used
+        """
+        if fcntl is None:
+            return False
+        
+        Path(chrome_profile_folder).mkdir(parents=True, exist_ok=True)
+        self._profile_lock = open(f"{chrome_profile_folder}.lock", 'w')
+        try:
+            fcntl.flock(self._profile_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            print("Chrome profile is in use by another login, using a temporary profile")
+            self._release_profile()
+            return False
+    
+    def _release_profile(self):
+        """Release the persistent Chrome profile lock"""
+        if self._profile_lock:
+            self._profile_lock.close()
+            self._profile_lock = None
+    
+    @staticmethod
+    def _chromedriver_path():
+        """
+        Resolve the chromedriver binary, reusing the last installed path for up to a week
+        
+        Returns:
+            str: Path to chromedriver executable
+        """
+        cache_file = Path(chromedriver_path_cache)
+        if cache_file.exists() and time.time() - cache_file.stat().st_mtime < chromedriver_cache_max_age:
+            driver_path = cache_file.read_text().strip()
+            if os.access(driver_path, os.X_OK):
+                return driver_path
+        
+        driver_path = ChromeDriverManager().install()
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(driver_path)
+        return driver_path
+    
+    def _generate_totp(self, next_window=False):
+        """
+        Generate TOTP code
+        
+        Args:
+            next_window (bool): Generate the code for the next 30s window instead,
+                                useful when the current one is about to roll over
+        """
+        if next_window:
+            return self._totp.at(time.time() + self._totp.interval)
+        return self._totp.now()
     
     def _enter_credentials(self, wait):
         """Enter user ID and password"""
@@ -110,33 +209,45 @@ class ZerodhaAutoLogin:
         totp_field.send_keys(totp)
         print("TOTP entered")
         
-        # Wait for auto-submission or submit manually
-        time.sleep(2)
-        
+        # Wait for auto-submission (returns as soon as the redirect happens) or submit manually
         try:
-            if "request_token" in self.driver.current_url:
-                print("TOTP auto-submitted successfully")
-            else:
+            WebDriverWait(self.driver, 3).until(EC.url_contains("request_token="))
+            print("TOTP auto-submitted successfully")
+        except TimeoutException:
+            try:
                 totp_field.send_keys(Keys.RETURN)
                 print("TOTP submitted using Enter key")
-        except Exception as e:
-            print(f"TOTP submission: {e}")
+            except Exception as e:
+                print(f"TOTP submission: {e}")
     
-    def _extract_request_token(self):
+    def _extract_request_token(self, wait):
         """Extract request token from URL"""
         print("Waiting for login to complete...")
-        time.sleep(3)
+        try:
+            wait.until(EC.url_contains("request_token="))
+        except TimeoutException:
+            print(f"Error: Request token not found in URL: {self.driver.current_url}")
+            return False
         
         current_url = self.driver.current_url
         print(f"Current URL: {current_url}")
         
-        if "request_token" in current_url:
-            self.request_token = current_url.split("request_token=")[1].split("&")[0]
-            print(f"Request Token: {self.request_token}")
-            return True
-        else:
-            print("Error: Request token not found in URL")
-            return False
+        self.request_token = self._parse_request_token(current_url)
+        print(f"Request Token: {self.request_token}")
+        return self.request_token is not None
+    
+    @staticmethod
+    def _parse_request_token(url):
+        """
+        Read the request_token query parameter from a redirect URL
+        
+        Args:
+            url (str): Redirect URL
+            
+        Returns:
+            str: Request token (URL-decoded) or None if not present
+        """
+        return parse_qs(urlparse(url).query).get('request_token', [None])[0]
     
     def _generate_access_token(self):
         """Generate access token from request token"""
@@ -158,18 +269,75 @@ class ZerodhaAutoLogin:
             "user_id": self.user_id
         }
         
-        with open(self.token_file, 'w') as f:
-            json.dump(tokens_data, f, indent=4)
+        # Write to a temp file and swap it in, so a crash never leaves a truncated token file
+        tmp_file = f"{self.token_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(tokens_data, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.token_file)
         
         print(f"\n✅ Tokens saved to {self.token_file}")
         return tokens_data
     
-    def login(self):
+    def _http_login(self):
         """
-        Execute complete login flow
+        Login through Kite's web API and read the request token off the connect redirect
         
         Returns:
-            dict: Dictionary containing tokens and metadata, or None if failed
+            bool: True if request token was obtained
+        """
+        try:
+            with requests.Session() as session:
+                # Step 1: Submit credentials
+                response = session.post(
+                    login_url,
+                    data={"user_id": self.user_id, "password": self.password},
+                    timeout=10
+                )
+                response.raise_for_status()
+                request_id = response.json()['data']['request_id']
+                print("Credentials accepted")
+                
+                # Step 2: Submit TOTP
+                response = session.post(
+                    twofa_url,
+                    data={
+                        "user_id": self.user_id,
+                        "request_id": request_id,
+                        "twofa_value": self._generate_totp(),
+                        "twofa_type": "totp"
+                    },
+                    timeout=10
+                )
+                response.raise_for_status()
+                print("TOTP accepted")
+                
+                # Step 3: Follow the connect redirects until the request token shows up
+                url = self.kite.login_url()
+                for _ in range(5):
+                    response = session.get(url, allow_redirects=False, timeout=10)
+                    location = response.headers.get("Location")
+                    if not location:
+                        break
+                    url = urljoin(url, location)
+                    self.request_token = self._parse_request_token(url)
+                    if self.request_token is not None:
+                        print(f"Request Token: {self.request_token}")
+                        return True
+            
+            print("Error: Request token not found in redirect")
+            return False
+        except Exception as e:
+            print(f"Web API login failed: {e}")
+            return False
+    
+    def _browser_login(self):
+        """
+        Login through Chrome and read the request token off the final URL
+        
+        Returns:
+            bool: True if request token was obtained
         """
         try:
             # Setup driver
@@ -186,21 +354,39 @@ class ZerodhaAutoLogin:
             # Wait object
             wait = WebDriverWait(self.driver, 10)
             
-            # Step 1: Enter credentials
+            # Enter credentials and TOTP
             self._enter_credentials(wait)
-            
-            # Step 2: Enter TOTP
             self._enter_totp(wait)
             
-            # Step 3: Extract request token
-            if not self._extract_request_token():
-                return None
+            return self._extract_request_token(wait)
+            
+        finally:
+            # Close browser
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
+                print("\nBrowser closed.")
+            self._release_profile()
+    
+    def login(self):
+        """
+        Execute complete login flow
+        
+        Returns:
+            dict: Dictionary containing tokens and metadata, or None if failed
+        """
+        try:
+            # Step 1: Get request token, falling back to the browser if the web API flow fails
+            if self.use_browser or not self._http_login():
+                print("Logging in through the browser...")
+                if not self._browser_login():
+                    return None
             
-            # Step 4: Generate access token
+            # Step 2: Generate access token
             if not self._generate_access_token():
                 return None
             
-            # Step 5: Save tokens
+            # Step 3: Save tokens
             tokens_data = self._save_tokens()
             
             print("\n✅ Login completed successfully!")
@@ -211,12 +397,6 @@ class ZerodhaAutoLogin:
             import traceback
             traceback.print_exc()
             return None
-            
-        finally:
-            # Close browser
-            if self.driver:
-                self.driver.quit()
-                print("\nBrowser closed.")
     
     def set_access_token(self):
         """Set access token to kite instance"""
@@ -239,8 +419,7 @@ class ZerodhaAutoLogin:
         """
         token_path = Path(zerodha_token_file)
         if token_path.exists():
-            with open(zerodha_token_file, 'r') as f:
-                return json.load(f)
+            return orjson.loads(token_path.read_bytes())
         else:
             print(f"Token file {zerodha_token_file} not found")
             return None
@@ -249,6 +428,9 @@ class ZerodhaAutoLogin:
         """
         Get KiteConnect instance with access token set
         
+        The instance keeps its pooled session, pass it to ZerodhaHistoricalData(kite=...)
+        to reuse the same connections instead of creating a new client from the token file.
+        
         Returns:
             KiteConnect: Authenticated KiteConnect instance
         """
@@ -280,11 +462,14 @@ if __name__ == "__main__":
         print("\n" + "="*50)
         print("Login Successful!")
         print("="*50)
-        print(json.dumps(tokens, indent=2))
+        print(orjson.dumps(tokens, option=orjson.OPT_INDENT_2).decode())
         
         # # Get authenticated kite instance
         # kite = zerodha.get_kite_instance()
         
+        # # Reuse it for historical data downloads
+        # hist_data = ZerodhaHistoricalData(kite=kite)
+        
         # # Now you can use kite for trading
         # # profile = kite.profile()
         # # print(profile)
@@ -4,12 +4,98 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from kiteconnect import KiteConnect
 from first_app.zerodha_config import api_key
 import datetime as dt
+import os
+import time
 import pandas as pd
-import json
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from kiteconnect.exceptions import KiteException
 from first_app.constants import *
+from first_app.code_files.kite_client import create_kite, RateLimiter
+
+# Historical API rate limit shared by all downloads in this process
+_rate_limiter = RateLimiter(max_calls=historical_requests_per_second, period=1.0)
+
+
+class _ChunkWriter:
+    """
+    Append processed OHLC chunks to a CSV or Parquet file as they arrive
+    
+    Chunks go to <output_file>.tmp, which replaces output_file only once the
+    whole download succeeded, so a failed download never leaves a truncated
+    file behind or clobbers the previous good one.
+    """
+    
+    def __init__(self, output_file):
+        """
+        Initialize _ChunkWriter
+        
+        Args:
+            output_file (str): Output filename, Parquet if it ends with .parquet else CSV
+        """
+        self.output_file = output_file
+        self.tmp_file = f"{output_file}.tmp"
+        self.is_parquet = Path(output_file).suffix == '.parquet'
+        self._csv_file = None
+        self._parquet_writer = None
+        self._empty_df = None
+    
+    def __enter__(self):
+        if not self.is_parquet:
+            self._csv_file = open(self.tmp_file, 'w', newline='')
+        return self
+    
+    def write(self, chunk_df):
+        """
+        Append one processed chunk
+        
+        Args:
+            chunk_df (pd.DataFrame): Processed OHLC chunk
+        """
+        if not self.is_parquet:
+            # CSV keeps the dd-mm-yyyy / HH:MM:SS text format
+            chunk_df.assign(
+                Time=(chunk_df['Date'] + chunk_df['Time']).dt.strftime('%H:%M:%S')
+            ).to_csv(
+                self._csv_file,
+                index=False,
+                header=self._csv_file.tell() == 0,
+                date_format='%d-%m-%Y'
+            )
+        elif chunk_df.empty:
+            # Empty chunks have no usable column types, keep one only in case nothing else arrives
+            self._empty_df = chunk_df
+        else:
+            table = pa.Table.from_pandas(chunk_df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.tmp_file, table.schema)
+            else:
+                table = table.cast(self._parquet_writer.schema)
+            self._parquet_writer.write_table(table)
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        failed = exc_type is not None
+        try:
+            if self._csv_file is not None:
+                self._csv_file.close()
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+            elif self.is_parquet and self._empty_df is not None and not failed:
+                self._empty_df.to_parquet(self.tmp_file, index=False)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # Same temp-file-then-replace idiom as _cache_chunk
+            if failed:
+                Path(self.tmp_file).unlink(missing_ok=True)
+            elif os.path.exists(self.tmp_file):
+                os.replace(self.tmp_file, self.output_file)
 
 
 class ZerodhaHistoricalData:
@@ -17,32 +103,34 @@ class ZerodhaHistoricalData:
     Class to download historical data from Zerodha Kite API
     """
     
-    def __init__(self):
+    def __init__(self, kite=None):
         """
         Initialize ZerodhaHistoricalData
         
         Args:
-            token_file (str): Path to the token file
+            kite (KiteConnect): Authenticated KiteConnect instance to reuse (optional),
+                                e.g. ZerodhaAutoLogin.get_kite_instance(). If not given,
+                                one is created from the token file.
         """
         self.token_file = zerodha_token_file
-        self.kite = None
+        self.kite = kite
         self.instrument_df = None
-        self._initialize_kite()
+        self._symbol_to_token = {}
+        if self.kite is None:
+            self._initialize_kite()
         self._load_instruments()
     
     def _initialize_kite(self):
         """Initialize KiteConnect with access token"""
         try:
             # Load tokens from file
-            with open(self.token_file, 'r') as f:
-                tokens = json.load(f)
+            tokens = orjson.loads(Path(self.token_file).read_bytes())
             
             access_token = tokens['access_token']
             api_key_from_file = tokens.get('api_key', api_key)
             
             # Initialize KiteConnect
-            self.kite = KiteConnect(api_key=api_key_from_file)
-            self.kite.set_access_token(access_token)
+            self.kite = create_kite(api_key_from_file, access_token)
             
             print(f"✅ KiteConnect initialized with access token")
             
@@ -62,14 +150,43 @@ class ZerodhaHistoricalData:
             exchange (str): Exchange name (NSE, BSE, NFO, etc.)
         """
         try:
-            print(f"Loading {exchange} instruments...")
-            instrument_dump = self.kite.instruments(exchange)
-            self.instrument_df = pd.DataFrame(instrument_dump)
+            # Instrument dump changes at most once a day, reuse a recent local copy
+            cache_file = Path(instruments_cache_folder) / f"{exchange}.parquet"
+            if cache_file.exists() and time.time() - cache_file.stat().st_mtime < instruments_cache_max_age:
+                print(f"Loading {exchange} instruments from {cache_file}...")
+                self.instrument_df = pd.read_parquet(cache_file)
+            else:
+                print(f"Loading {exchange} instruments...")
+                instrument_dump = self.kite.instruments(exchange)
+                self.instrument_df = pd.DataFrame(instrument_dump)
+                self._cache_instruments(cache_file)
+            
+            # Symbol -> token map for O(1) lookups
+            unique_symbols = self.instrument_df.drop_duplicates('tradingsymbol')
+            self._symbol_to_token = dict(zip(
+                unique_symbols['tradingsymbol'].tolist(),
+                unique_symbols['instrument_token'].tolist()
+            ))
             print(f"✅ Loaded {len(self.instrument_df)} instruments from {exchange}")
         except Exception as e:
             print(f"❌ Error loading instruments: {e}")
             raise
     
+    def _cache_instruments(self, cache_file):
+        """
+        Save instrument dump to the local parquet cache
+        
+        Args:
+            cache_file (Path): Cache file path
+        """
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            self.instrument_df.to_parquet(tmp_file, index=False, compression='snappy')
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"⚠️ Could not cache instruments: {e}")
+    
     def save_instruments_to_csv(self, filename=None, exchange="NSE"):
         """
         Save instrument dump to CSV file
@@ -94,16 +211,25 @@ class ZerodhaHistoricalData:
         Returns:
             int: Instrument token or -1 if not found
         """
-        try:
-            token = self.instrument_df[
-                self.instrument_df.tradingsymbol == symbol
-            ].instrument_token.values[0]
-            return token
-        except:
+        token = self._symbol_to_token.get(symbol, -1)
+        if token == -1:
             print(f"❌ Symbol '{symbol}' not found in instrument list")
-            return -1
+        return token
+    
+    def instrument_lookup_batch(self, symbols):
+        """
+        Look up instrument tokens for several symbols at once
+        
+        Args:
+            symbols (list): Trading symbols
+            
+        Returns:
+            dict: Symbol -> instrument token (-1 if not found)
+        """
+        return {symbol: self._symbol_to_token.get(symbol, -1) for symbol in symbols}
     
-    def fetch_ohlc(self, ticker, inception_date, interval, output_file=None):
+    def fetch_ohlc(self, ticker, inception_date, interval, output_file=None, return_data=True,
+                   instrument_token=None):
         """
         Fetch historical OHLC data for a given ticker
         
@@ -112,10 +238,14 @@ class ZerodhaHistoricalData:
             inception_date (str): Start date in 'dd-mm-yyyy' format
             interval (str): Interval - 'minute', '3minute', '5minute', '10minute', 
                            '15minute', '30minute', '60minute', 'day'
-            output_file (str): Optional output CSV filename
+            output_file (str): Optional output filename (.csv or .parquet), written chunk by chunk
+            return_data (bool): Build and return the combined DataFrame (default: True).
+                                Set to False to keep memory bounded to one chunk when only
+                                the output file is needed.
+            instrument_token (int): Already resolved instrument token, skips the symbol lookup
             
         Returns:
-            pd.DataFrame: OHLC data
+            pd.DataFrame: OHLC data, or the output file path if return_data is False
         """
         print(f"\n{'='*60}")
         print(f"Fetching data for: {ticker}")
@@ -123,125 +253,263 @@ class ZerodhaHistoricalData:
         print(f"{'='*60}\n")
         
         # Get instrument token
-        instrument = self.instrument_lookup(ticker)
+        instrument = instrument_token if instrument_token is not None else self.instrument_lookup(ticker)
         if instrument == -1:
             return None
         
         # Parse dates
-        from_date = dt.datetime.strptime(inception_date, '%d-%m-%Y')
-        to_date = dt.date.today()
-        
-        # Initialize empty dataframe
-        data = pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+        from_date = dt.datetime.strptime(inception_date, '%d-%m-%Y').date()
+        chunk_ranges = self._chunk_ranges(from_date, dt.date.today())
         
-        # Fetch data in chunks of 100 days
+        # Fetch all 100-day chunks concurrently and write each one out as it arrives (in order)
         print("Downloading data...")
-        chunk_count = 0
-        while True:
-            if from_date.date() >= (dt.date.today() - dt.timedelta(100)):
-                # Last chunk
-                chunk_data = self.kite.historical_data(
-                    instrument, 
-                    from_date, 
-                    dt.date.today(), 
-                    interval
-                )
-                data = pd.concat([data, pd.DataFrame(chunk_data)], ignore_index=True)
-                chunk_count += 1
-                print(f"  Chunk {chunk_count}: {from_date.date()} to {dt.date.today()}")
-                break
-            else:
-                # Fetch 100-day chunk
-                to_date = from_date + dt.timedelta(100)
-                chunk_data = self.kite.historical_data(
-                    instrument, 
-                    from_date, 
-                    to_date, 
-                    interval
-                )
-                data = pd.concat([data, pd.DataFrame(chunk_data)], ignore_index=True)
-                chunk_count += 1
-                print(f"  Chunk {chunk_count}: {from_date.date()} to {to_date.date()}")
-                from_date = to_date
-        
-        print(f"\n✅ Downloaded {len(data)} records")
-        
-        # Process the data
-        data = self._process_data(data)
-        
-        # Save to CSV if filename provided
+        with ThreadPoolExecutor(max_workers=historical_max_workers) as executor:
+            chunks = executor.map(
+                lambda chunk_range: self._fetch_chunk(instrument, *chunk_range, interval),
+                chunk_ranges
+            )
+            data, record_count = self._write_chunks(chunk_ranges, chunks, output_file, return_data)
+        
+        print(f"\n✅ Downloaded {record_count} records")
         if output_file:
-            data.to_csv(output_file, index=False)
             print(f"✅ Data saved to {output_file}")
         
+        if not return_data:
+            return output_file
         return data
     
-    def _process_data(self, data):
+    def _write_chunks(self, chunk_ranges, chunks, output_file=None, return_data=True):
         """
-        Process raw data - add Date and Time columns, format properly
+        Process downloaded chunks in order and append them to the output file
         
         Args:
-            data (pd.DataFrame): Raw OHLC data
+            chunk_ranges (list): List of (from_date, to_date) tuples
+            chunks (iterable): Candle lists in the same order as chunk_ranges
+            output_file (str): Optional output filename (.csv or .parquet)
+            return_data (bool): Build the combined DataFrame
+            
+        Returns:
+            tuple: (combined DataFrame or None, number of records)
+        """
+        frames = []
+        record_count = 0
+        last_timestamp = None
+        with _ChunkWriter(output_file) if output_file else nullcontext() as writer:
+            for chunk_count, ((chunk_from, chunk_to), chunk_data) in enumerate(zip(chunk_ranges, chunks), start=1):
+                chunk_df = self._process_data(self._to_frame(chunk_data))
+                
+                # Drop candles already written by an earlier chunk
+                timestamps = chunk_df['Date'] + chunk_df['Time']
+                keep = ~timestamps.duplicated()
+                if last_timestamp is not None:
+                    keep &= timestamps > last_timestamp
+                chunk_df = chunk_df[keep.to_numpy()]
+                if not chunk_df.empty:
+                    last_timestamp = timestamps[keep].max()
+                
+                record_count += len(chunk_df)
+                if writer:
+                    writer.write(chunk_df)
+                if return_data:
+                    frames.append(chunk_df)
+                print(f"  Chunk {chunk_count}: {chunk_from} to {chunk_to}")
+        
+        data = pd.concat(frames, ignore_index=True) if return_data else None
+        return data, record_count
+    
+    def _fetch_chunk(self, instrument, from_date, to_date, interval):
+        """
+        Fetch one chunk of candles, served from the local cache if it was downloaded before
+        
+        Args:
+            instrument (int): Instrument token
+            from_date (datetime.date): Chunk start date
+            to_date (datetime.date): Chunk end date
+            interval (str): Candle interval
             
         Returns:
-            pd.DataFrame: Processed data
+            list: List of candle dicts
         """
-        # Set date as index temporarily
-        data.set_index("date", inplace=True)
+        cache_file = Path(historical_cache_folder) / str(instrument) / interval / f"{from_date}_{to_date}.parquet"
+        if cache_file.exists():
+            return pq.read_table(cache_file).to_pylist()
         
-        # Reset index to bring date back as column
-        data = data.reset_index()
+        # Kite allows ~3 historical requests per second
+        for attempt in range(1, historical_rate_limit_retries + 1):
+            with _rate_limiter:
+                try:
+                    chunk_data = self.kite.historical_data(instrument, from_date, to_date, interval)
+                    break
+                except KiteException as e:
+                    # Still rate limited after the HTTP-level retries, slow the whole process down
+                    if e.code != 429 or attempt == historical_rate_limit_retries:
+                        raise
+            _rate_limiter.slow_down()
+            print(f"⚠️ Rate limited on {from_date} to {to_date}, retrying at {_rate_limiter.rate:.2f} req/s")
         
-        # Convert to datetime
-        data['Datetime'] = pd.to_datetime(data['date'])
+        # Only windows that ended before today are final, today's candles are still forming
+        if chunk_data and to_date < dt.date.today():
+            self._cache_chunk(cache_file, chunk_data)
+        return chunk_data
+    
+    @staticmethod
+    def _cache_chunk(cache_file, chunk_data):
+        """
+        Save one chunk of candles to the local parquet cache
         
-        # Create Date and Time columns
-        data['Date'] = data['Datetime'].dt.strftime('%d-%m-%Y')
-        data['Time'] = data['Datetime'].dt.time
+        Args:
+            cache_file (Path): Cache file path
+            chunk_data (list): List of candle dicts
+        """
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so a concurrent reader never sees a partial shard
+            tmp_file = cache_file.with_suffix('.tmp')
+            pq.write_table(pa.Table.from_pylist(chunk_data), tmp_file)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"⚠️ Could not cache chunk {cache_file.name}: {e}")
+    
+    @staticmethod
+    def _chunk_ranges(from_date, to_date, chunk_days=historical_chunk_days):
+        """
+        Split a date range into consecutive chunks accepted by the historical API
         
-        # Remove timezone information
-        data['Datetime'] = data['Datetime'].dt.tz_localize(None)
+        A date-only end covers that whole day, so each chunk ends the day before
+        the next one starts and no day is downloaded twice.
         
-        # Drop intermediate columns
-        data = data.drop(columns=['Datetime', 'date'])
+        Args:
+            from_date (datetime.date): Start date
+            to_date (datetime.date): End date
+            chunk_days (int): Maximum number of days per chunk
+            
+        Returns:
+            list: List of (from_date, to_date) tuples
+        """
+        offsets = range(0, max((to_date - from_date).days, 0) + 1, chunk_days)
+        return [
+            (from_date + dt.timedelta(offset), min(from_date + dt.timedelta(offset + chunk_days - 1), to_date))
+            for offset in offsets
+        ]
+    
+    @staticmethod
+    def _to_frame(chunk_data):
+        """
+        Build a typed OHLC DataFrame from raw historical records
         
-        # Reorder columns: Date, Time, open, high, low, close, volume
-        data = data[['Date', 'Time'] + [col for col in data.columns if col not in ['Date', 'Time']]]
+        Prices stay float64: float32 would round tick prices (100.05 becomes
+        100.05000305) in the returned DataFrame and in Parquet output.
         
-        return data
+        Args:
+            chunk_data (list): List of candle dicts returned by kite.historical_data
+            
+        Returns:
+            pd.DataFrame: Raw OHLC data with explicit dtypes
+        """
+        return pd.DataFrame(chunk_data, columns=['date', 'open', 'high', 'low', 'close', 'volume']).astype({
+            'open': 'float64',
+            'high': 'float64',
+            'low': 'float64',
+            'close': 'float64',
+            'volume': 'int64'
+        })
+    
+    def _process_data(self, data):
+        """
+        Process raw data - split the timestamp into Date and Time columns
+        
+        Date is kept as datetime64 (midnight) and Time as timedelta64 since midnight,
+        both vectorized; string formatting happens only when writing CSV.
+        
+        Args:
+            data (pd.DataFrame): Raw OHLC data
+            
+        Returns:
+            pd.DataFrame: Processed data with columns Date, Time, open, high, low, close, volume
+        """
+        # Convert to datetime and remove timezone information (keeps exchange local time)
+        datetime_col = pd.to_datetime(data['date']).dt.tz_localize(None)
+        date_col = datetime_col.dt.floor('D')
+        
+        data = data.assign(Date=date_col, Time=datetime_col - date_col).drop(columns='date')
+        
+        # Reorder columns: Date, Time, open, high, low, close, volume
+        return data[['Date', 'Time'] + [col for col in data.columns if col not in ['Date', 'Time']]]
     
-    def fetch_multiple_tickers(self, tickers_config, base_output_dir='data'):
+    def fetch_multiple_tickers(self, tickers_config, base_output_dir='data', file_format='csv'):
         """
         Fetch data for multiple tickers
         
+        Chunks of all tickers are downloaded through one shared thread pool, so the
+        batch takes about as long as its longest ticker rather than the sum of all.
+        
         Args:
             tickers_config (list): List of dicts with keys: ticker, inception_date, interval
-            base_output_dir (str): Base directory to save CSV files
+            base_output_dir (str): Base directory to save the files
+            file_format (str): 'csv' or 'parquet'
             
         Example:
             tickers_config = [
                 {'ticker': 'NIFTY 50', 'inception_date': '01-01-2025', 'interval': '5minute'},
                 {'ticker': 'RELIANCE', 'inception_date': '01-01-2024', 'interval': 'day'}
             ]
+            
+        Returns:
+            dict: Per-ticker result with success flag and file/records or error
         """
         # Create output directory if it doesn't exist
         output_path = Path(base_output_dir)
         output_path.mkdir(exist_ok=True)
         
         results = {}
-        for config in tickers_config:
-            ticker = config['ticker']
-            inception_date = config['inception_date']
-            interval = config['interval']
+        jobs = []
+        instruments = self.instrument_lookup_batch([config['ticker'] for config in tickers_config])
+        with ThreadPoolExecutor(max_workers=historical_batch_workers) as executor:
+            # Submit every chunk of every ticker to one shared pool
+            for config in tickers_config:
+                ticker = config['ticker']
+                interval = config['interval']
+                results[ticker] = None
+                try:
+                    instrument = instruments[ticker]
+                    if instrument == -1:
+                        raise ValueError(f"Symbol '{ticker}' not found in instrument list")
+                    from_date = dt.datetime.strptime(config['inception_date'], '%d-%m-%Y').date()
+                except Exception as e:
+                    print(f"❌ Error fetching {ticker}: {e}")
+                    results[ticker] = {'success': False, 'error': str(e)}
+                    continue
+                
+                chunk_ranges = self._chunk_ranges(from_date, dt.date.today())
+                futures = [
+                    executor.submit(self._fetch_chunk, instrument, chunk_from, chunk_to, interval)
+                    for chunk_from, chunk_to in chunk_ranges
+                ]
+                jobs.append((ticker, interval, chunk_ranges, futures))
             
-            # Generate filename
+            # Report progress as chunks complete, in whatever order they finish
+            chunk_info = {
+                future: (ticker, chunk_range)
+                for ticker, _, chunk_ranges, futures in jobs
+                for chunk_range, future in zip(chunk_ranges, futures)
+            }
+            print(f"Downloading {len(chunk_info)} chunks for {len(jobs)} tickers...")
+            for done, future in enumerate(as_completed(chunk_info), start=1):
+                ticker, (chunk_from, chunk_to) = chunk_info[future]
+                status = "❌" if future.exception() else "✅"
+                print(f"  [{done}/{len(chunk_info)}] {status} {ticker}: {chunk_from} to {chunk_to}")
+        
+        # Regroup chunks by ticker and write one file per ticker
+        for ticker, interval, chunk_ranges, futures in jobs:
             ticker_clean = ticker.replace(' ', '-').lower()
-            output_file = output_path / f"{ticker_clean}-{interval}-data.csv"
+            output_file = output_path / f"{ticker_clean}-{interval}-data.{file_format}"
             
-            # Fetch data
+            print(f"\nSaving {ticker}...")
             try:
-                data = self.fetch_ohlc(ticker, inception_date, interval, str(output_file))
-                results[ticker] = {'success': True, 'file': str(output_file), 'records': len(data)}
+                chunks = (future.result() for future in futures)
+                _, record_count = self._write_chunks(chunk_ranges, chunks, str(output_file), return_data=False)
+                print(f"✅ Data saved to {output_file}")
+                results[ticker] = {'success': True, 'file': str(output_file), 'records': record_count}
             except Exception as e:
                 print(f"❌ Error fetching {ticker}: {e}")
                 results[ticker] = {'success': False, 'error': str(e)}
@@ -6,33 +6,609 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from pathlib import Path
 
+# Numba is optional - only needed for engine='numba'
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels below still import without numba"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Compiled Cython kernels are optional - only needed for engine='cython'
+# (build them with `python setup.py build_ext --inplace`)
+try:
+    from first_app.code_files import _indicators_core
+except ImportError:
+    _indicators_core = None
+
+# Bottleneck is optional - C moving min/max for the Stochastic
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+
+# ==========================================
+# Numba Kernels (engine='numba')
+# ==========================================
+# Single-pass versions of the rolling-mean based RSI / ATR / ADX and the
+# EWM based EMA / MACD below.
+# They keep the same simple-average definitions as the pandas path so
+# both engines give the same numbers.
+
+@njit(cache=True)
+def _window_add(total, nonzero, nans, value, sign):
+    """
+    Add (sign=1) or remove (sign=-1) a value from a running window sum
+    
+    Tracks NaN and non-zero counts so an all-zero window sums to exactly
+    0.0 and a window holding a NaN can be reported as NaN, like pandas.
+    """
+    if np.isnan(value):
+        return total, nonzero, nans + sign
+    if value != 0.0:
+        nonzero += sign
+    total += sign * value
+    if nonzero == 0:
+        total = 0.0
+    return total, nonzero, nans
+
+
+@njit(cache=True)
+def _true_range(high, low, close, i):
+    """True range of bar i, skipping NaN terms like DataFrame.max(axis=1)"""
+    result = high[i] - low[i]
+    if i == 0:
+        return result
+    for value in (abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])):
+        if not np.isnan(value) and (np.isnan(result) or value > result):
+            result = value
+    return result
+
+
+@njit(cache=True)
+def _gain_loss(close, i):
+    """Gain and loss of bar i versus the previous close"""
+    if i == 0:
+        return 0.0, 0.0
+    delta = close[i] - close[i - 1]
+    return (delta if delta > 0 else 0.0), (-delta if delta < 0 else 0.0)
+
+
+@njit(cache=True)
+def _directional_movement(high, low, i):
+    """+DM and -DM of bar i"""
+    if i == 0:
+        return 0.0, 0.0
+    up = high[i] - high[i - 1]
+    down = low[i - 1] - low[i]
+    plus_dm = up if (up > down and up > 0) else 0.0
+    minus_dm = down if (down > up and down > 0) else 0.0
+    return plus_dm, minus_dm
+
+
+@njit(cache=True, error_model='numpy')
+def _rsi_kernel(close, period):
+    """RSI over rolling mean gain / loss in one pass"""
+    n = close.size
+    out = np.full_like(close, np.nan)
+    gain_sum, gain_nz, gain_nan = 0.0, 0, 0
+    loss_sum, loss_nz, loss_nan = 0.0, 0, 0
+    
+    for i in range(n):
+        gain, loss = _gain_loss(close, i)
+        gain_sum, gain_nz, gain_nan = _window_add(gain_sum, gain_nz, gain_nan, gain, 1)
+        loss_sum, loss_nz, loss_nan = _window_add(loss_sum, loss_nz, loss_nan, loss, 1)
+        if i >= period:
+            gain, loss = _gain_loss(close, i - period)
+            gain_sum, gain_nz, gain_nan = _window_add(gain_sum, gain_nz, gain_nan, gain, -1)
+            loss_sum, loss_nz, loss_nan = _window_add(loss_sum, loss_nz, loss_nan, loss, -1)
+        
+        if i >= period - 1:
+            rs = (gain_sum / period) / (loss_sum / period)
+            out[i] = 100 - (100 / (1 + rs))
+    return out
+
+
+@njit(cache=True, error_model='numpy')
+def _atr_kernel(high, low, close, period):
+    """ATR as a rolling mean of true range in one pass"""
+    n = high.size
+    out = np.full_like(high, np.nan)
+    tr_sum, tr_nz, tr_nan = 0.0, 0, 0
+    
+    for i in range(n):
+        tr_sum, tr_nz, tr_nan = _window_add(tr_sum, tr_nz, tr_nan, _true_range(high, low, close, i), 1)
+        if i >= period:
+            tr_sum, tr_nz, tr_nan = _window_add(tr_sum, tr_nz, tr_nan, _true_range(high, low, close, i - period), -1)
+        
+        if i >= period - 1 and tr_nan == 0:
+            out[i] = tr_sum / period
+    return out
+
+
+@njit(cache=True, error_model='numpy')
+def _adx_kernel(high, low, close, period):
+    """ADX, +DI and -DI in one pass"""
+    n = high.size
+    adx = np.full_like(high, np.nan)
+    plus_di = np.full_like(high, np.nan)
+    minus_di = np.full_like(high, np.nan)
+    dx = np.full_like(high, np.nan)
+    tr_sum, tr_nz, tr_nan = 0.0, 0, 0
+    plus_sum, plus_nz, plus_nan = 0.0, 0, 0
+    minus_sum, minus_nz, minus_nan = 0.0, 0, 0
+    dx_sum, dx_nz, dx_nan = 0.0, 0, 0
+    
+    for i in range(n):
+        # Rolling true range and directional movement
+        tr_sum, tr_nz, tr_nan = _window_add(tr_sum, tr_nz, tr_nan, _true_range(high, low, close, i), 1)
+        plus_dm, minus_dm = _directional_movement(high, low, i)
+        plus_sum, plus_nz, plus_nan = _window_add(plus_sum, plus_nz, plus_nan, plus_dm, 1)
+        minus_sum, minus_nz, minus_nan = _window_add(minus_sum, minus_nz, minus_nan, minus_dm, 1)
+        if i >= period:
+            tr_sum, tr_nz, tr_nan = _window_add(tr_sum, tr_nz, tr_nan, _true_range(high, low, close, i - period), -1)
+            plus_dm, minus_dm = _directional_movement(high, low, i - period)
+            plus_sum, plus_nz, plus_nan = _window_add(plus_sum, plus_nz, plus_nan, plus_dm, -1)
+            minus_sum, minus_nz, minus_nan = _window_add(minus_sum, minus_nz, minus_nan, minus_dm, -1)
+        
+        # Directional indicators and DX
+        if i >= period - 1 and tr_nan == 0:
+            atr = tr_sum / period
+            plus_di[i] = 100 * ((plus_sum / period) / atr)
+            minus_di[i] = 100 * ((minus_sum / period) / atr)
+            dx[i] = 100 * abs(plus_di[i] - minus_di[i]) / (plus_di[i] + minus_di[i])
+        
+        # Rolling mean of DX
+        dx_sum, dx_nz, dx_nan = _window_add(dx_sum, dx_nz, dx_nan, dx[i], 1)
+        if i >= period:
+            dx_sum, dx_nz, dx_nan = _window_add(dx_sum, dx_nz, dx_nan, dx[i - period], -1)
+        if i >= period - 1 and dx_nan == 0:
+            adx[i] = dx_sum / period
+    return adx, plus_di, minus_di
+
+
+@njit(cache=True)
+def _ewm_update(weighted, old_wt, value, alpha):
+    """
+    Advance one adjust=False EWM state by one bar
+    
+    Mirrors pandas' ewm(...).mean() update (ignore_na=False), so NaN
+    bars carry the last value forward and decay the old weight.
+    """
+    if np.isnan(weighted):
+        return value, old_wt
+    old_wt *= 1 - alpha
+    if not np.isnan(value):
+        if weighted != value:
+            weighted = (old_wt * weighted + alpha * value) / (old_wt + alpha)
+        old_wt = 1.0
+    return weighted, old_wt
+
+
+@njit(cache=True)
+def _ewm(values, alpha):
+    """adjust=False exponential moving average in one pass"""
+    out = np.empty_like(values)
+    weighted, old_wt = np.nan, 1.0
+    for i in range(values.size):
+        weighted, old_wt = _ewm_update(weighted, old_wt, values[i], alpha)
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True)
+def _macd_kernel(close, fast, slow, signal):
+    """MACD line, signal line and histogram in one pass"""
+    n = close.size
+    macd = np.empty_like(close)
+    macd_signal = np.empty_like(close)
+    histogram = np.empty_like(close)
+    alpha_fast, alpha_slow, alpha_signal = 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1)
+    fast_ema, fast_wt = np.nan, 1.0
+    slow_ema, slow_wt = np.nan, 1.0
+    signal_ema, signal_wt = np.nan, 1.0
+    
+    for i in range(n):
+        fast_ema, fast_wt = _ewm_update(fast_ema, fast_wt, close[i], alpha_fast)
+        slow_ema, slow_wt = _ewm_update(slow_ema, slow_wt, close[i], alpha_slow)
+        macd[i] = fast_ema - slow_ema
+        signal_ema, signal_wt = _ewm_update(signal_ema, signal_wt, macd[i], alpha_signal)
+        macd_signal[i] = signal_ema
+        histogram[i] = macd[i] - signal_ema
+    return macd, macd_signal, histogram
+
+
+@njit(cache=True)
+def _move_min(values, period):
+    """
+    Rolling minimum with a monotonic deque in O(N)
+    
+    Windows containing a NaN come out as NaN, like rolling(window).min().
+    """
+    n = values.size
+    out = np.full_like(values, np.nan)
+    window = np.empty(n, dtype=np.int64)
+    head, tail, nans = 0, 0, 0
+    
+    for i in range(n):
+        if np.isnan(values[i]):
+            nans += 1
+        else:
+            while tail > head and values[window[tail - 1]] >= values[i]:
+                tail -= 1
+            window[tail] = i
+            tail += 1
+        
+        if i >= period:
+            if np.isnan(values[i - period]):
+                nans -= 1
+            while tail > head and window[head] <= i - period:
+                head += 1
+        
+        if i >= period - 1 and nans == 0:
+            out[i] = values[window[head]]
+    return out
+
+
+# Output rows of _all_basic_kernel, in add_all_basic_indicators column order
+BASIC_COLUMNS = [
+    'SMA_20', 'EMA_20', 'SMA_50', 'SMA_200', 'RSI_14',
+    'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'BB_Middle', 'BB_Upper', 'BB_Lower', 'BB_Width',
+    'ATR_14', 'Volume_SMA_20',
+]
+
+
+@njit(cache=True, error_model='numpy')
+def _all_basic_kernel(high, low, close, volume, out):
+    """
+    Every add_all_basic_indicators column in one pass over the bars
+    
+    Fills out (len(BASIC_COLUMNS), n) in place, keeping the running
+    state of each indicator side by side: SMA 20/50/200 (20 doubles as
+    the Bollinger middle band), EMA 20, RSI 14, MACD 12/26/9, Bollinger
+    20/2, ATR 14 and volume SMA 20.
+    """
+    n = close.size
+    sma_periods = np.array([20, 50, 200])
+    sma_rows = np.array([0, 2, 3])
+    sma_sums = np.zeros(3)
+    sma_nz = np.zeros(3, dtype=np.int64)
+    sma_nans = np.zeros(3, dtype=np.int64)
+    ema, ema_wt = np.nan, 1.0
+    fast_ema, fast_wt = np.nan, 1.0
+    slow_ema, slow_wt = np.nan, 1.0
+    signal_ema, signal_wt = np.nan, 1.0
+    gain_sum, gain_nz, gain_nan = 0.0, 0, 0
+    loss_sum, loss_nz, loss_nan = 0.0, 0, 0
+    tr_sum, tr_nz, tr_nan = 0.0, 0, 0
+    vol_sum, vol_nz, vol_nan = 0.0, 0, 0
+    
+    for i in range(n):
+        x = close[i]
+        
+        # SMA 20 / 50 / 200
+        for k in range(3):
+            period = sma_periods[k]
+            sma_sums[k], sma_nz[k], sma_nans[k] = _window_add(sma_sums[k], sma_nz[k], sma_nans[k], x, 1)
+            if i >= period:
+                sma_sums[k], sma_nz[k], sma_nans[k] = _window_add(sma_sums[k], sma_nz[k], sma_nans[k], close[i - period], -1)
+            if i >= period - 1 and sma_nans[k] == 0:
+                out[sma_rows[k], i] = sma_sums[k] / period
+        
+        # EMA 20 and MACD 12 / 26 / 9
+        ema, ema_wt = _ewm_update(ema, ema_wt, x, 2.0 / 21)
+        out[1, i] = ema
+        fast_ema, fast_wt = _ewm_update(fast_ema, fast_wt, x, 2.0 / 13)
+        slow_ema, slow_wt = _ewm_update(slow_ema, slow_wt, x, 2.0 / 27)
+        macd = fast_ema - slow_ema
+        signal_ema, signal_wt = _ewm_update(signal_ema, signal_wt, macd, 2.0 / 10)
+        out[5, i] = macd
+        out[6, i] = signal_ema
+        out[7, i] = macd - signal_ema
+        
+        # RSI 14
+        gain, loss = _gain_loss(close, i)
+        gain_sum, gain_nz, gain_nan = _window_add(gain_sum, gain_nz, gain_nan, gain, 1)
+        loss_sum, loss_nz, loss_nan = _window_add(loss_sum, loss_nz, loss_nan, loss, 1)
+        if i >= 14:
+            gain, loss = _gain_loss(close, i - 14)
+            gain_sum, gain_nz, gain_nan = _window_add(gain_sum, gain_nz, gain_nan, gain, -1)
+            loss_sum, loss_nz, loss_nan = _window_add(loss_sum, loss_nz, loss_nan, loss, -1)
+        if i >= 13:
+            out[4, i] = 100 - (100 / (1 + (gain_sum / 14) / (loss_sum / 14)))
+        
+        # Bollinger Bands 20 / 2 (sample std over the SMA 20 window)
+        if i >= 19 and sma_nans[0] == 0:
+            mean = sma_sums[0] / 20
+            sq_sum = 0.0
+            flat = True
+            for j in range(i - 19, i + 1):
+                sq_sum += (close[j] - mean) ** 2
+                flat = flat and close[j] == x
+            std = 0.0 if flat else np.sqrt(sq_sum / 19)
+            out[8, i] = mean
+            out[9, i] = mean + 2 * std
+            out[10, i] = mean - 2 * std
+            out[11, i] = 4 * std
+        
+        # ATR 14
+        tr_sum, tr_nz, tr_nan = _window_add(tr_sum, tr_nz, tr_nan, _true_range(high, low, close, i), 1)
+        if i >= 14:
+            tr_sum, tr_nz, tr_nan = _window_add(tr_sum, tr_nz, tr_nan, _true_range(high, low, close, i - 14), -1)
+        if i >= 13 and tr_nan == 0:
+            out[12, i] = tr_sum / 14
+        
+        # Volume SMA 20
+        vol_sum, vol_nz, vol_nan = _window_add(vol_sum, vol_nz, vol_nan, volume[i], 1)
+        if i >= 20:
+            vol_sum, vol_nz, vol_nan = _window_add(vol_sum, vol_nz, vol_nan, volume[i - 20], -1)
+        if i >= 19 and vol_nan == 0:
+            out[13, i] = vol_sum / 20
+
+
+@njit(cache=True, parallel=True)
+def _all_basic_panel(high, low, close, volume, lengths, out):
+    """
+    Run _all_basic_kernel for every ticker of a (n_bars, n_tickers) panel
+    
+    Tickers are independent, so prange spreads them over threads that
+    run without the GIL. Ticker j occupies rows [0, lengths[j]) and its
+    results go to out[:, :lengths[j], j].
+    """
+    for j in prange(close.shape[1]):
+        n = lengths[j]
+        _all_basic_kernel(high[:n, j], low[:n, j], close[:n, j], volume[:n, j], out[:, :n, j])
+
+
+# ==========================================
+# Array Helpers
+# ==========================================
+
+def _as_float(values):
+    """Return values as a float ndarray, keeping float32 as float32"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.floating):
+        return values
+    return values.astype(np.float64)
+
+
+def _window_sum(values, period):
+    """
+    Sum of every full window via a cumulative-sum difference
+    
+    The running sum is always accumulated in float64, whatever the input
+    dtype, so float32 prices don't drift over long series.
+    
+    Args:
+        values (np.ndarray): Float input values (period <= len)
+        period (int): Window length
+    
+    Returns:
+        np.ndarray: len - period + 1 float64 sums, NaN where the window holds a NaN
+    """
+    missing = np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values), dtype=np.float64)))
+    sums = csum[period:] - csum[:-period]
+    
+    if missing.any():
+        nan_count = np.concatenate(([0], np.cumsum(missing)))
+        sums[nan_count[period:] - nan_count[:-period] > 0] = np.nan
+    return sums
+
+
+def _sma(values, period):
+    """
+    Simple moving average via a cumulative-sum difference
+    
+    Windows containing a NaN come out as NaN, like rolling(window).mean().
+    
+    Args:
+        values (np.ndarray): Input values
+        period (int): Window length
+    
+    Returns:
+        np.ndarray: Moving average in the input's float dtype, with a NaN warm-up
+    """
+    values = _as_float(values)
+    out = np.full(values.size, np.nan, dtype=values.dtype)
+    if period > values.size:
+        return out
+    
+    out[period - 1:] = _window_sum(values, period) / period
+    return out
+
+
+def _rolling_std(values, period, ddof=1, block=4096):
+    """
+    Rolling standard deviation from cumulative sums of x and x*x
+    
+    Windows are processed in blocks, each centred on its own first valid
+    value, so the x*x sums stay small enough to keep their precision on
+    long series. Windows with no change at all are pinned to exactly 0
+    like rolling(window).std().
+    
+    Args:
+        values (np.ndarray): Input values
+        period (int): Window length
+        ddof (int): Delta degrees of freedom
+        block (int): Windows per centred block
+    
+    Returns:
+        np.ndarray: Standard deviation in the input's float dtype, with a NaN warm-up
+    """
+    values = _as_float(values)
+    out = np.full(values.size, np.nan, dtype=values.dtype)
+    values = values.astype(np.float64)
+    n = values.size
+    if period > n or period <= ddof:
+        return out
+    
+    var = np.empty(n - period + 1)
+    for start in range(0, n - period + 1, block):
+        chunk = values[start:start + block + period - 1]
+        valid = chunk[~np.isnan(chunk)]
+        centred = chunk - (valid[0] if valid.size else 0.0)
+        window_sum = _window_sum(centred, period)
+        window_sum2 = _window_sum(centred * centred, period)
+        var[start:start + window_sum.size] = (window_sum2 - window_sum * window_sum / period) / (period - ddof)
+    var = np.maximum(var, 0.0)
+    
+    # Flat windows
+    changes = np.concatenate(([0], np.cumsum(np.diff(values) != 0)))
+    var[changes[period - 1:] == changes[:n - period + 1]] = 0.0
+    
+    out[period - 1:] = np.sqrt(var)
+    return out
+
+
+# OHLC columns, stored in the ZerodhaIndicators dtype
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+# Column types for historical data CSVs (Date/Time stay as text so
+# save_to_csv writes them back unchanged; prices use the chosen dtype)
+CSV_DTYPES = {
+    'Date': str,
+    'Time': str,
+    'volume': np.int64,
+}
+
+
+def parse_datetime(df):
+    """
+    Build a DatetimeIndex from the Date and Time columns
+    
+    Handles the text columns of historical CSVs (dd-mm-yyyy, HH:MM:SS)
+    as well as the datetime64 Date + timedelta64 Time written to Parquet
+    by ZerodhaHistoricalData.
+    
+    Args:
+        df (pd.DataFrame): Data with Date and Time columns
+    
+    Returns:
+        pd.DatetimeIndex: Candle timestamps (NaT where unparseable), or None without Date/Time
+    """
+    if 'Date' not in df.columns or 'Time' not in df.columns:
+        return None
+    
+    date, time = df['Date'], df['Time']
+    if pd.api.types.is_datetime64_any_dtype(date) and pd.api.types.is_timedelta64_dtype(time):
+        timestamps = date + time
+    else:
+        timestamps = pd.to_datetime(date.astype(str) + ' ' + time.astype(str),
+                                    format='%d-%m-%Y %H:%M:%S', cache=True, errors='coerce')
+    return pd.DatetimeIndex(timestamps, name='DateTime')
+
 
 class ZerodhaIndicators:
     """
     Class to apply technical indicators on historical data
     """
     
-    def __init__(self, csv_file=None, dataframe=None):
+    def __init__(self, csv_file=None, dataframe=None, engine='pandas', dtype=np.float64, parquet_file=None):
         """
-        Initialize with either a CSV file or a DataFrame
+        Initialize with either a CSV file, a Parquet file or a DataFrame
         
         Args:
             csv_file (str): Path to CSV file with historical data
             dataframe (pd.DataFrame): DataFrame with historical data
+            engine (str): 'pandas' (default), 'numba' or 'cython' for compiled EMA/RSI/MACD/ATR/ADX
+            dtype (np.dtype): Float type for prices and indicators. float32 halves memory
+                (running sums are still accumulated in float64), but rounding the prices
+                can break tick-size ties, shifting ADX and flipping candlestick flags
+            parquet_file (str): Path to Parquet file with historical data
         """
+        if engine not in ('pandas', 'numba', 'cython'):
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine == 'numba' and not NUMBA_AVAILABLE:
+            raise ValueError("engine='numba' requires numba to be installed")
+        if engine == 'cython' and _indicators_core is None:
+            raise ValueError("engine='cython' requires the compiled kernels (python setup.py build_ext --inplace)")
+        self.engine = engine
+        self.dtype = np.dtype(dtype)
+        
         if csv_file:
-            self.df = pd.read_csv(csv_file)
+            csv_dtypes = {**CSV_DTYPES, **dict.fromkeys(PRICE_COLUMNS, self.dtype)}
+            try:
+                self.df = pd.read_csv(csv_file, engine='pyarrow', dtype=csv_dtypes)
+            except pd.errors.IntCastingNaNError:
+                # Blank volume cells can't be int64, read volume as float instead
+                print(f"⚠️ {csv_file} has missing volume values, reading volume as float")
+                self.df = pd.read_csv(csv_file, engine='pyarrow', dtype={**csv_dtypes, 'volume': np.float64})
             print(f"✅ Loaded data from {csv_file}")
+        elif parquet_file:
+            df = pd.read_parquet(parquet_file, engine='pyarrow')
+            self.df = df.astype({col: self.dtype for col in PRICE_COLUMNS if col in df.columns})
+            print(f"✅ Loaded data from {parquet_file}")
         elif dataframe is not None:
-            self.df = dataframe.copy()
+            self.df = dataframe.astype({col: self.dtype for col in PRICE_COLUMNS if col in dataframe.columns})
             print(f"✅ Loaded data from DataFrame")
         else:
-            raise ValueError("Either csv_file or dataframe must be provided")
+            raise ValueError("Either csv_file, parquet_file or dataframe must be provided")
         
         print(f"   Total records: {len(self.df)}")
         self._validate_data()
+        
+        # Parse Date + Time once and keep it on the index for plotting
+        timestamps = parse_datetime(self.df)
+        if timestamps is not None:
+            self.df.index = timestamps
+        
+        # Memoized SMA/EMA arrays per source column: column -> (snapshot of the
+        # column, {(kind, period): array}), dropped when the column changes
+        self._cache = {}
+    
+    @classmethod
+    def from_panel(cls, frames, dtype=np.float64):
+        """
+        Add the basic indicators to several tickers in one parallel pass
+        
+        Stacks each ticker's high/low/close/volume into (n_bars, n_tickers)
+        panels and runs the fused add_all_basic_indicators kernel over the
+        ticker axis with numba's prange.
+        
+        Args:
+            frames (dict): Ticker -> DataFrame or ZerodhaIndicators with historical data
+            dtype (np.dtype): Float type for prices and indicators
+        
+        Returns:
+            dict: Ticker -> ZerodhaIndicators with the basic indicators added
+        """
+        if not NUMBA_AVAILABLE:
+            raise ValueError("from_panel requires numba to be installed")
+        
+        indicators = {
+            ticker: data if isinstance(data, cls) else cls(dataframe=data, dtype=dtype)
+            for ticker, data in frames.items()
+        }
+        lengths = np.array([len(ind.df) for ind in indicators.values()], dtype=np.int64)
+        n_bars, n_tickers = lengths.max(initial=0), len(indicators)
+        
+        # Column-major panels so each ticker's bars are contiguous
+        panels = {col: np.full((n_bars, n_tickers), np.nan, dtype=dtype, order='F') for col in ('high', 'low', 'close')}
+        panels['volume'] = np.full((n_bars, n_tickers), np.nan, order='F')
+        for j, ind in enumerate(indicators.values()):
+            for col, panel in panels.items():
+                panel[:lengths[j], j] = ind.df[col].to_numpy()
+        
+        print(f"\n📊 Adding basic indicators for {n_tickers} tickers...")
+        out = np.full((len(BASIC_COLUMNS), n_bars, n_tickers), np.nan, dtype=dtype, order='F')
+        _all_basic_panel(panels['high'], panels['low'], panels['close'], panels['volume'], lengths, out)
+        
+        for j, ind in enumerate(indicators.values()):
+            ind._assign_columns(dict(zip(BASIC_COLUMNS, out[:, :lengths[j], j])))
+        print("✅ All basic indicators added!")
+        return indicators
     
     def _validate_data(self):
         """Validate that required columns exist"""
@@ -44,6 +620,87 @@ class ZerodhaIndicators:
         
         print(f"   Columns: {list(self.df.columns)}")
     
+    def _hlc_arrays(self):
+        """High, low and close as arrays of the indicator dtype"""
+        return tuple(self.df[col].to_numpy(dtype=self.dtype) for col in ('high', 'low', 'close'))
+    
+    def _column_cache(self, column):
+        """
+        Memoized SMA/EMA arrays computed from a column
+        
+        One snapshot of the column is kept; when its values change, every
+        result computed from it is dropped together.
+        
+        Args:
+            column (str): Source column
+            
+        Returns:
+            dict: (kind, period) -> np.ndarray
+        """
+        values = self.df[column].to_numpy()
+        entry = self._cache.get(column)
+        if entry is None or not np.array_equal(entry[0], values, equal_nan=True):
+            entry = self._cache[column] = (values.copy(), {})
+        return entry[1]
+    
+    def _cached_sma(self, column, period, cache=None):
+        """SMA of a column in the indicator dtype, memoized per (column, period)"""
+        cache = self._column_cache(column) if cache is None else cache
+        if ('sma', period) not in cache:
+            cache['sma', period] = _sma(self.df[column].to_numpy(dtype=self.dtype), period)
+        return cache['sma', period]
+    
+    def _cached_ema(self, column, period, cache=None):
+        """
+        EMA of a column as a float64 array, memoized per (column, period)
+        
+        Kept in float64 so MACD can difference two EMAs without losing
+        precision; callers cast to the indicator dtype when storing.
+        """
+        cache = self._column_cache(column) if cache is None else cache
+        if ('ema', period) not in cache:
+            cache['ema', period] = self._ewm_values(self.df[column].to_numpy(dtype=np.float64), period)
+        return cache['ema', period]
+    
+    def _ewm_values(self, values, span):
+        """adjust=False EWM of a float64 array with the selected engine"""
+        if self.engine == 'numba':
+            return _ewm(values, 2.0 / (span + 1))
+        if self.engine == 'cython':
+            return _indicators_core.ewm(values, 2.0 / (span + 1))
+        return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    
+    def _assign_columns(self, columns):
+        """
+        Add several indicator columns in one go
+        
+        New columns are appended with a single concat instead of one
+        block insert each; columns that already exist are overwritten in
+        place so re-running an indicator keeps the column order.
+        
+        Args:
+            columns (dict): Column name -> array or Series
+        """
+        if any(col in self.df.columns for col in columns):
+            for col, values in columns.items():
+                self.df[col] = values
+            return
+        
+        self.df = pd.concat([self.df, pd.DataFrame(columns, index=self.df.index)], axis=1)
+    
+    @staticmethod
+    def _true_range_array(high, low, close):
+        """
+        True range as an ndarray
+        
+        np.fmax skips NaN like DataFrame.max(axis=1), so the first bar
+        (no previous close) still gets high - low.
+        """
+        prev_close = np.full_like(close, np.nan)
+        prev_close[1:] = close[:-1]
+        
+        return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    
     # ==========================================
     # Moving Averages
     # ==========================================
@@ -58,7 +715,7 @@ class ZerodhaIndicators:
             name (str): Custom column name (optional)
         """
         col_name = name or f'SMA_{period}'
-        self.df[col_name] = self.df[column].rolling(window=period).mean()
+        self.df[col_name] = self._cached_sma(column, period)
         print(f"✅ Added {col_name}")
         return self
     
@@ -72,7 +729,7 @@ class ZerodhaIndicators:
             name (str): Custom column name (optional)
         """
         col_name = name or f'EMA_{period}'
-        self.df[col_name] = self.df[column].ewm(span=period, adjust=False).mean()
+        self.df[col_name] = self._cached_ema(column, period).astype(self.dtype)
         print(f"✅ Added {col_name}")
         return self
     
@@ -86,10 +743,15 @@ class ZerodhaIndicators:
             name (str): Custom column name (optional)
         """
         col_name = name or f'WMA_{period}'
-        weights = np.arange(1, period + 1)
-        self.df[col_name] = self.df[column].rolling(window=period).apply(
-            lambda prices: np.dot(prices, weights) / weights.sum(), raw=True
-        )
+        values = self.df[column].to_numpy(dtype=self.dtype)
+        weights = np.arange(1, period + 1, dtype=self.dtype)
+        weights /= weights.sum()
+        
+        # All windows as a strided (n - period + 1, period) view, weighted in one matrix-vector product
+        wma = np.full(len(values), np.nan, dtype=self.dtype)
+        if len(values) >= period:
+            wma[period - 1:] = sliding_window_view(values, period) @ weights
+        self.df[col_name] = wma
         print(f"✅ Added {col_name}")
         return self
     
@@ -108,11 +770,23 @@ class ZerodhaIndicators:
         """
         col_name = name or f'RSI_{period}'
         
-        delta = self.df[column].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        if self.engine == 'numba':
+            self.df[col_name] = _rsi_kernel(self.df[column].to_numpy(dtype=self.dtype), period)
+            print(f"✅ Added {col_name}")
+            return self
+        if self.engine == 'cython':
+            self.df[col_name] = _indicators_core.rsi(self.df[column].to_numpy(dtype=self.dtype), period)
+            print(f"✅ Added {col_name}")
+            return self
         
-        rs = gain / loss
+        values = self.df[column].to_numpy(dtype=self.dtype)
+        delta = np.full_like(values, np.nan)
+        delta[1:] = np.diff(values)
+        gain = _sma(np.where(delta > 0, delta, 0.0), period)
+        loss = _sma(np.where(delta < 0, -delta, 0.0), period)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
         self.df[col_name] = 100 - (100 / (1 + rs))
         print(f"✅ Added {col_name}")
         return self
@@ -131,13 +805,19 @@ class ZerodhaIndicators:
             signal (int): Signal line period
             column (str): Column to calculate MACD on
         """
-        exp1 = self.df[column].ewm(span=fast, adjust=False).mean()
-        exp2 = self.df[column].ewm(span=slow, adjust=False).mean()
+        cache = self._column_cache(column)
+        emas_cached = all(('ema', span) in cache for span in (fast, slow))
         
-        self.df['MACD'] = exp1 - exp2
-        self.df['MACD_Signal'] = self.df['MACD'].ewm(span=signal, adjust=False).mean()
-        self.df['MACD_Histogram'] = self.df['MACD'] - self.df['MACD_Signal']
+        if self.engine == 'numba' and not emas_cached:
+            macd, macd_signal, histogram = _macd_kernel(self.df[column].to_numpy(dtype=self.dtype), fast, slow, signal)
+        else:
+            # Reuses EMAs already computed by add_ema (or an earlier MACD)
+            macd = self._cached_ema(column, fast, cache) - self._cached_ema(column, slow, cache)
+            macd_signal = self._ewm_values(macd, signal)
+            histogram = macd - macd_signal
+            macd, macd_signal, histogram = (array.astype(self.dtype) for array in (macd, macd_signal, histogram))
         
+        self._assign_columns({'MACD': macd, 'MACD_Signal': macd_signal, 'MACD_Histogram': histogram})
         print(f"✅ Added MACD (Fast={fast}, Slow={slow}, Signal={signal})")
         return self
     
@@ -154,12 +834,13 @@ class ZerodhaIndicators:
             std_dev (int): Number of standard deviations
             column (str): Column to calculate bands on
         """
-        self.df['BB_Middle'] = self.df[column].rolling(window=period).mean()
-        rolling_std = self.df[column].rolling(window=period).std()
+        values = self.df[column].to_numpy(dtype=self.dtype)
+        middle = self._cached_sma(column, period)
+        rolling_std = _rolling_std(values, period)
         
-        self.df['BB_Upper'] = self.df['BB_Middle'] + (rolling_std * std_dev)
-        self.df['BB_Lower'] = self.df['BB_Middle'] - (rolling_std * std_dev)
-        self.df['BB_Width'] = self.df['BB_Upper'] - self.df['BB_Lower']
+        upper = middle + (rolling_std * std_dev)
+        lower = middle - (rolling_std * std_dev)
+        self._assign_columns({'BB_Middle': middle, 'BB_Upper': upper, 'BB_Lower': lower, 'BB_Width': upper - lower})
         
         print(f"✅ Added Bollinger Bands (Period={period}, StdDev={std_dev})")
         return self
@@ -178,12 +859,16 @@ class ZerodhaIndicators:
         """
         col_name = name or f'ATR_{period}'
         
-        high_low = self.df['high'] - self.df['low']
-        high_close = np.abs(self.df['high'] - self.df['close'].shift())
-        low_close = np.abs(self.df['low'] - self.df['close'].shift())
+        if self.engine == 'numba':
+            self.df[col_name] = _atr_kernel(*self._hlc_arrays(), period)
+            print(f"✅ Added {col_name}")
+            return self
+        if self.engine == 'cython':
+            self.df[col_name] = _indicators_core.atr(*self._hlc_arrays(), period)
+            print(f"✅ Added {col_name}")
+            return self
         
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        self.df[col_name] = true_range.rolling(window=period).mean()
+        self.df[col_name] = _sma(self._true_range_array(*self._hlc_arrays()), period)
         
         print(f"✅ Added {col_name}")
         return self
@@ -200,11 +885,24 @@ class ZerodhaIndicators:
             k_period (int): Period for %K
             d_period (int): Period for %D
         """
-        lowest_low = self.df['low'].rolling(window=k_period).min()
-        highest_high = self.df['high'].rolling(window=k_period).max()
+        high, low, close = self._hlc_arrays()
+        
+        if k_period > len(self.df):
+            lowest_low = highest_high = np.full(len(self.df), np.nan, dtype=self.dtype)
+        elif self.engine == 'numba':
+            lowest_low = _move_min(low, k_period)
+            highest_high = -_move_min(-high, k_period)
+        elif bn is not None:
+            lowest_low = bn.move_min(low, k_period)
+            highest_high = bn.move_max(high, k_period)
+        else:
+            lowest_low = self.df['low'].rolling(window=k_period).min().to_numpy()
+            highest_high = self.df['high'].rolling(window=k_period).max().to_numpy()
         
-        self.df['Stoch_K'] = 100 * ((self.df['close'] - lowest_low) / (highest_high - lowest_low))
-        self.df['Stoch_D'] = self.df['Stoch_K'].rolling(window=d_period).mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stoch_k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+        stoch_d = _sma(stoch_k, d_period)
+        self._assign_columns({'Stoch_K': stoch_k, 'Stoch_D': stoch_d})
         
         print(f"✅ Added Stochastic (K={k_period}, D={d_period})")
         return self
@@ -220,26 +918,31 @@ class ZerodhaIndicators:
         Args:
             period (int): Period for ADX
         """
-        high_diff = self.df['high'].diff()
-        low_diff = -self.df['low'].diff()
-        
-        plus_dm = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0)
-        minus_dm = low_diff.where((low_diff > high_diff) & (low_diff > 0), 0)
-        
-        # Calculate ATR
-        high_low = self.df['high'] - self.df['low']
-        high_close = np.abs(self.df['high'] - self.df['close'].shift())
-        low_close = np.abs(self.df['low'] - self.df['close'].shift())
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
-        
-        plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
+        if self.engine == 'numba':
+            adx, plus_di, minus_di = _adx_kernel(*self._hlc_arrays(), period)
+        elif self.engine == 'cython':
+            adx, plus_di, minus_di = _indicators_core.adx(*self._hlc_arrays(), period)
+        else:
+            # Read high/low/close once and reuse them for DM and true range
+            high, low, close = self._hlc_arrays()
+            high_diff = np.full_like(high, np.nan)
+            high_diff[1:] = np.diff(high)
+            low_diff = np.full_like(low, np.nan)
+            low_diff[1:] = -np.diff(low)
+            
+            plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+            minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
+            
+            # Calculate ATR
+            atr = _sma(self._true_range_array(high, low, close), period)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                plus_di = 100 * (_sma(plus_dm, period) / atr)
+                minus_di = 100 * (_sma(minus_dm, period) / atr)
+                dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            adx = _sma(dx, period)
         
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-        self.df['ADX'] = dx.rolling(window=period).mean()
-        self.df['Plus_DI'] = plus_di
-        self.df['Minus_DI'] = minus_di
+        self._assign_columns({'ADX': adx, 'Plus_DI': plus_di, 'Minus_DI': minus_di})
         
         print(f"✅ Added ADX (Period={period})")
         return self
@@ -250,22 +953,23 @@ class ZerodhaIndicators:
     
     def add_volume_sma(self, period=20):
         """Add Simple Moving Average of Volume"""
-        self.df[f'Volume_SMA_{period}'] = self.df['volume'].rolling(window=period).mean()
+        self.df[f'Volume_SMA_{period}'] = _sma(self.df['volume'].to_numpy(dtype=np.float64), period)
         print(f"✅ Added Volume_SMA_{period}")
         return self
     
     def add_obv(self):
         """Add On-Balance Volume"""
-        obv = [0]
-        for i in range(1, len(self.df)):
-            if self.df['close'].iloc[i] > self.df['close'].iloc[i-1]:
-                obv.append(obv[-1] + self.df['volume'].iloc[i])
-            elif self.df['close'].iloc[i] < self.df['close'].iloc[i-1]:
-                obv.append(obv[-1] - self.df['volume'].iloc[i])
-            else:
-                obv.append(obv[-1])
-        
-        self.df['OBV'] = obv
+        close = self.df['close'].to_numpy()
+        volume = self.df['volume'].to_numpy()
+        
+        # +volume on up closes, -volume on down closes, 0 when unchanged (and on the first bar)
+        signed_volume = np.zeros_like(volume)
+        signed_volume[1:] = np.where(
+            close[1:] > close[:-1], volume[1:],
+            np.where(close[1:] < close[:-1], -volume[1:], 0)
+        )
+        
+        self.df['OBV'] = np.cumsum(signed_volume)
         print(f"✅ Added OBV (On-Balance Volume)")
         return self
     
@@ -275,11 +979,17 @@ class ZerodhaIndicators:
     
     def add_pivot_points(self):
         """Add Classic Pivot Points"""
-        self.df['Pivot'] = (self.df['high'] + self.df['low'] + self.df['close']) / 3
-        self.df['R1'] = 2 * self.df['Pivot'] - self.df['low']
-        self.df['S1'] = 2 * self.df['Pivot'] - self.df['high']
-        self.df['R2'] = self.df['Pivot'] + (self.df['high'] - self.df['low'])
-        self.df['S2'] = self.df['Pivot'] - (self.df['high'] - self.df['low'])
+        high, low, close = self._hlc_arrays()
+        pivot = (high + low + close) / 3
+        high_low = high - low
+        
+        self._assign_columns({
+            'Pivot': pivot,
+            'R1': 2 * pivot - low,
+            'S1': 2 * pivot - high,
+            'R2': pivot + high_low,
+            'S2': pivot - high_low,
+        })
         
         print(f"✅ Added Pivot Points")
         return self
@@ -290,25 +1000,35 @@ class ZerodhaIndicators:
     
     def add_candlestick_patterns(self):
         """Identify basic candlestick patterns"""
+        open_, high, low, close = (self.df[col].to_numpy(dtype=self.dtype) for col in ('open', 'high', 'low', 'close'))
+        
         # Doji
-        body = abs(self.df['close'] - self.df['open'])
-        range_val = self.df['high'] - self.df['low']
-        self.df['Doji'] = (body / range_val < 0.1).astype(int)
+        body = np.abs(close - open_)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            doji = body / (high - low) < 0.1
         
         # Hammer
-        lower_shadow = self.df[['open', 'close']].min(axis=1) - self.df['low']
-        upper_shadow = self.df['high'] - self.df[['open', 'close']].max(axis=1)
-        self.df['Hammer'] = ((lower_shadow > 2 * body) & (upper_shadow < body)).astype(int)
+        lower_shadow = np.minimum(open_, close) - low
+        upper_shadow = high - np.maximum(open_, close)
+        hammer = (lower_shadow > 2 * body) & (upper_shadow < body)
         
         # Bullish Engulfing (simplified)
-        prev_close = self.df['close'].shift(1)
-        prev_open = self.df['open'].shift(1)
-        self.df['Bullish_Engulfing'] = (
-            (self.df['close'] > self.df['open']) &
+        prev_close = np.full_like(close, np.nan)
+        prev_close[1:] = close[:-1]
+        prev_open = np.full_like(open_, np.nan)
+        prev_open[1:] = open_[:-1]
+        bullish_engulfing = (
+            (close > open_) &
             (prev_close < prev_open) &
-            (self.df['open'] < prev_close) &
-            (self.df['close'] > prev_open)
-        ).astype(int)
+            (open_ < prev_close) &
+            (close > prev_open)
+        )
+        
+        self._assign_columns({
+            'Doji': doji.view(np.uint8),
+            'Hammer': hammer.view(np.uint8),
+            'Bullish_Engulfing': bullish_engulfing.view(np.uint8),
+        })
         
         print(f"✅ Added Candlestick Patterns (Doji, Hammer, Bullish Engulfing)")
         return self
@@ -317,18 +1037,31 @@ class ZerodhaIndicators:
     # Utility Methods
     # ==========================================
     
-    def add_all_basic_indicators(self):
-        """Add all basic commonly used indicators"""
+    def add_all_basic_indicators(self, fast=False):
+        """
+        Add all basic commonly used indicators
+        
+        Args:
+            fast (bool): Compute them all in one fused numba pass (requires numba)
+        """
         print("\n📊 Adding all basic indicators...")
-        self.add_sma(20)
-        self.add_ema(20)
-        self.add_sma(50)
-        self.add_sma(200)
-        self.add_rsi(14)
-        self.add_macd()
-        self.add_bollinger_bands()
-        self.add_atr()
-        self.add_volume_sma(20)
+        if fast:
+            if not NUMBA_AVAILABLE:
+                raise ValueError("fast=True requires numba to be installed")
+            high, low, close = self._hlc_arrays()
+            out = np.full((len(BASIC_COLUMNS), len(close)), np.nan, dtype=self.dtype)
+            _all_basic_kernel(high, low, close, self.df['volume'].to_numpy(dtype=np.float64), out)
+            self._assign_columns(dict(zip(BASIC_COLUMNS, out)))
+        else:
+            self.add_sma(20)
+            self.add_ema(20)
+            self.add_sma(50)
+            self.add_sma(200)
+            self.add_rsi(14)
+            self.add_macd()
+            self.add_bollinger_bands()
+            self.add_atr()
+            self.add_volume_sma(20)
         print("✅ All basic indicators added!")
         return self
     
@@ -346,6 +1079,31 @@ class ZerodhaIndicators:
         self.df.to_csv(output_file, index=False)
         print(f"✅ Data with indicators saved to {output_file}")
     
+    def save_to_parquet(self, output_file):
+        """
+        Save DataFrame with indicators to Parquet (zstd compressed)
+        
+        Args:
+            output_file (str): Output file path
+        """
+        self.df.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
+        print(f"✅ Data with indicators saved to {output_file}")
+    
+    def save(self, output_file):
+        """
+        Save DataFrame with indicators, picking the format from the suffix
+        
+        Args:
+            output_file (str): Output file path (.parquet or .csv)
+        """
+        suffix = Path(output_file).suffix.lower()
+        if suffix == '.parquet':
+            self.save_to_parquet(output_file)
+        elif suffix == '.csv':
+            self.save_to_csv(output_file)
+        else:
+            raise ValueError(f"Unsupported file type: {output_file}")
+    
     def get_latest_values(self, num_rows=5):
         """
         Get latest values with indicators
@@ -366,8 +1124,7 @@ class ZerodhaIndicators:
         
         print(f"Total indicators: {len(indicator_cols)}")
         print("\nIndicators present:")
-        for col in indicator_cols:
-            non_null = self.df[col].notna().sum()
+        for col, non_null in self.df[indicator_cols].count().items():
             print(f"  • {col}: {non_null} valid values")
 
 
@@ -0,0 +1,170 @@
+from kiteconnect import KiteConnect
+from urllib3.util.retry import Retry
+import threading
+import time
+from first_app.constants import *
+
+# HTTP/2 transport is used when httpx and h2 are installed, requests (HTTP/1.1) otherwise
+try:
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting how many API calls start per period
+    
+    Usage:
+        limiter = RateLimiter(max_calls=3, period=1.0)
+        with limiter:
+            kite.historical_data(...)
+    """
+    
+    def __init__(self, max_calls, period=1.0):
+        """
+        Initialize RateLimiter
+        
+        Args:
+            max_calls (int): Calls allowed per period (also the burst size)
+            period (float): Period in seconds
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self.rate = max_calls / period
+        self._min_rate = self.rate / 8
+        self._tokens = float(max_calls)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.max_calls, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return self
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def slow_down(self):
+        """Halve the refill rate, used when the server keeps answering 429"""
+        with self._lock:
+            self.rate = max(self.rate / 2, self._min_rate)
+
+
+class _Http2Session:
+    """
+    Minimal requests.Session stand-in that sends kiteconnect's calls over HTTP/2
+    
+    Parallel requests are multiplexed as streams over one TCP+TLS connection
+    instead of each needing its own pooled connection.
+    """
+    
+    retry_statuses = (429, 502, 503, 504)
+    retry_methods = ("GET", "PUT", "DELETE")
+    
+    def __init__(self, pool_size, verify=True, retries=3, backoff_factor=0.3):
+        """
+        Initialize _Http2Session
+        
+        Args:
+            pool_size (int): Maximum number of connections
+            verify (bool): Verify SSL certificates
+            retries (int): Retries for idempotent requests on 429/5xx gateway errors
+            backoff_factor (float): Exponential backoff base in seconds
+        """
+        self.client = httpx.Client(
+            http2=True,
+            verify=verify,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=30.0
+        )
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+    
+    def request(self, method, url, params=None, data=None, json=None, headers=None,
+                allow_redirects=True, timeout=None, **kwargs):
+        """
+        Send a request with the requests.Session.request signature used by kiteconnect
+        
+        verify and proxies are client level settings in httpx and are ignored here.
+        
+        Returns:
+            httpx.Response: Response (exposes status_code, headers, content, json())
+        """
+        if params:
+            # httpx only encodes primitives, requests also accepted dates and the like via str()
+            params = {
+                key: value if isinstance(value, (str, int, float, list)) else str(value)
+                for key, value in params.items()
+            }
+        
+        for attempt in range(self.retries + 1):
+            response = self.client.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                json=json,
+                headers=headers,
+                follow_redirects=allow_redirects,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+            )
+            if (response.status_code not in self.retry_statuses
+                    or method not in self.retry_methods
+                    or attempt == self.retries):
+                return response
+            
+            retry_after = response.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else self.backoff_factor * 2 ** attempt)
+    
+    def close(self):
+        """Close the underlying connections"""
+        self.client.close()
+
+
+def create_kite(api_key, access_token=None, pool_size=kite_pool_size, http2=True):
+    """
+    Create a KiteConnect instance with a keep-alive connection pool
+    
+    Every call made through the instance (login, instruments, historical data)
+    reuses pooled HTTPS connections instead of paying a new TCP+TLS handshake,
+    and transient gateway errors and 429s are retried with backoff (honouring
+    Retry-After). Once retries run out the last response is handed back to
+    kiteconnect so it raises its usual typed exception.
+    
+    Args:
+        api_key (str): Zerodha API key
+        access_token (str): Access token (optional, can be set later)
+        pool_size (int): Number of pooled connections
+        http2 (bool): Use an HTTP/2 session when httpx[http2] is installed (default: True)
+        
+    Returns:
+        KiteConnect: Configured KiteConnect instance
+    """
+    kite = KiteConnect(
+        api_key=api_key,
+        access_token=access_token,
+        pool={
+            "pool_connections": pool_size,
+            "pool_maxsize": pool_size,
+            "max_retries": Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                raise_on_status=False
+            )
+        }
+    )
+    
+    if http2 and httpx is not None and not kite.proxies:
+        kite.reqsession = _Http2Session(pool_size, verify=not kite.disable_ssl)
+    
+    return kite
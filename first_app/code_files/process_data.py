@@ -6,29 +6,27 @@ from first_app.code_files.visualize_indicators import plot_rsi
 
 hist_data_obj = ZerodhaHistoricalData()
 
-ticker = "RPOWER"
-# ticker = "HINDZINC"
+tickers = ["RPOWER", "HINDZINC"]
 inception_date = "01-01-2025"
 interval = "5minute"
 
-output_file = f"{historical_data_folder}/{ticker}.csv"
-indicator_file_name = f"{historical_data_folder}/{ticker}_with_indicators.csv"
-
 os.makedirs(historical_data_folder, exist_ok=True)
 
 
-ohlc = hist_data_obj.fetch_ohlc(
-    ticker = ticker,
-    inception_date = inception_date,
-    interval = interval,
-    output_file = output_file
+results = hist_data_obj.fetch_multiple_tickers(
+    [{'ticker': ticker, 'inception_date': inception_date, 'interval': interval} for ticker in tickers],
+    base_output_dir = historical_data_folder,
+    file_format = 'parquet'
 )
 
-indicators = ZerodhaIndicators(csv_file = output_file)
-indicators.add_rsi(14)
-indicators.save_to_csv(indicator_file_name)
-
-indicators.get_indicator_summary()
+# Basic indicators for every downloaded ticker in one parallel pass
+panel = ZerodhaIndicators.from_panel({
+    ticker: ZerodhaIndicators(parquet_file = result['file'])
+    for ticker, result in results.items() if result['success']
+})
 
-# plot_rsi(output_file, 5000)
+for ticker, indicators in panel.items():
+    indicators.save(f"{historical_data_folder}/{ticker}_with_indicators.parquet")
+    indicators.get_indicator_summary()
 
+# plot_rsi(panel["RPOWER"], 5000)
@@ -9,48 +9,55 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from first_app.code_files.indicators import ZerodhaIndicators
+from first_app.code_files.indicators import ZerodhaIndicators, parse_datetime
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
 
-def plot_price_with_sma(csv_file, num_candles=100):
+def _recent_candles(data, num_candles):
     """
-    Plot price with moving averages
+    Take the last candles to plot from a DataFrame or ZerodhaIndicators
     
     Args:
-        csv_file (str): CSV file path
+        data (pd.DataFrame | ZerodhaIndicators): Data that already holds the indicator columns
         num_candles (int): Number of recent candles to plot
-    """
-    # Load and add indicators
-    ind = ZerodhaIndicators(csv_file=csv_file)
-    ind.add_sma(20)
-    ind.add_sma(50)
-    ind.add_ema(20)
     
-    df = ind.get_dataframe().tail(num_candles).copy()
+    Returns:
+        pd.DataFrame: Copy of the last num_candles rows, indexed by DateTime
+    """
+    if isinstance(data, ZerodhaIndicators):
+        data = data.get_dataframe()
+    df = data.tail(num_candles).copy()
+    
+    # ZerodhaIndicators already puts DateTime on the index
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = parse_datetime(df)
+    return df
+
+
+def plot_price_with_sma(data, num_candles=100):
+    """
+    Plot price with moving averages
     
-    # Create datetime column for x-axis - handle different time formats
-    try:
-        # Try direct conversion first
-        df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'].astype(str))
-    except:
-        # If that fails, try converting Time column differently
-        df['Time_str'] = df['Time'].apply(lambda x: str(x) if pd.notna(x) else '00:00:00')
-        df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time_str'])
+    Args:
+        data (pd.DataFrame | ZerodhaIndicators): Data with SMA_20, SMA_50 and EMA_20
+        num_candles (int): Number of recent candles to plot
+    """
+    df = _recent_candles(data, num_candles)
     
     # Debug: Print first few datetime values
-    print(f"Sample DateTime values:\n{df[['Date', 'Time', 'DateTime']].head()}")
+    print(f"Sample DateTime values:\n{df[['Date', 'Time']].head()}")
     
     # Create figure
     fig, ax = plt.subplots(figsize=(15, 7))
     
     # Plot price and moving averages
-    ax.plot(df['DateTime'], df['close'], label='Close', linewidth=2, color='black')
-    ax.plot(df['DateTime'], df['SMA_20'], label='SMA 20', linewidth=1.5, color='blue', alpha=0.7)
-    ax.plot(df['DateTime'], df['SMA_50'], label='SMA 50', linewidth=1.5, color='red', alpha=0.7)
-    ax.plot(df['DateTime'], df['EMA_20'], label='EMA 20', linewidth=1.5, color='green', alpha=0.7, linestyle='--')
+    ax.plot(df.index, df['close'], label='Close', linewidth=2, color='black')
+    ax.plot(df.index, df['SMA_20'], label='SMA 20', linewidth=1.5, color='blue', alpha=0.7)
+    ax.plot(df.index, df['SMA_50'], label='SMA 50', linewidth=1.5, color='red', alpha=0.7)
+    ax.plot(df.index, df['EMA_20'], label='EMA 20', linewidth=1.5, color='green', alpha=0.7, linestyle='--')
     
     # Format x-axis to show dates and times properly
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b\n%H:%M'))
@@ -69,28 +76,21 @@ def plot_price_with_sma(csv_file, num_candles=100):
     plt.show()
 
 
-def plot_rsi(csv_file, num_candles=100):
+def plot_rsi(data, num_candles=100):
     """
     Plot RSI indicator
     
     Args:
-        csv_file (str): CSV file path
+        data (pd.DataFrame | ZerodhaIndicators): Data with RSI_14
         num_candles (int): Number of recent candles to plot
     """
-    # Load and add RSI
-    ind = ZerodhaIndicators(csv_file=csv_file)
-    ind.add_rsi(14)
-    
-    df = ind.get_dataframe().tail(num_candles)
-    
-    # Create datetime column
-    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'].astype(str))
+    df = _recent_candles(data, num_candles)
     
     # Create figure with 2 subplots
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10), height_ratios=[2, 1])
     
     # Plot price
-    ax1.plot(df['DateTime'], df['close'], label='Close', linewidth=2, color='black')
+    ax1.plot(df.index, df['close'], label='Close', linewidth=2, color='black')
     ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
     ax1.set_title('Price Chart', fontsize=14, fontweight='bold')
@@ -99,10 +99,10 @@ def plot_rsi(csv_file, num_candles=100):
     ax1.grid(True, alpha=0.3)
     
     # Plot RSI
-    ax2.plot(df['DateTime'], df['RSI_14'], label='RSI 14', linewidth=2, color='purple')
+    ax2.plot(df.index, df['RSI_14'], label='RSI 14', linewidth=2, color='purple')
     ax2.axhline(y=70, color='r', linestyle='--', label='Overbought (70)')
     ax2.axhline(y=30, color='g', linestyle='--', label='Oversold (30)')
-    ax2.fill_between(df['DateTime'], 30, 70, alpha=0.1, color='gray')
+    ax2.fill_between(df.index, 30, 70, alpha=0.1, color='gray')
     ax2.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
     ax2.set_title('RSI Indicator', fontsize=14, fontweight='bold')
@@ -118,28 +118,21 @@ def plot_rsi(csv_file, num_candles=100):
     plt.show()
 
 
-def plot_macd(csv_file, num_candles=100):
+def plot_macd(data, num_candles=100):
     """
     Plot MACD indicator
     
     Args:
-        csv_file (str): CSV file path
+        data (pd.DataFrame | ZerodhaIndicators): Data with MACD columns
         num_candles (int): Number of recent candles to plot
     """
-    # Load and add MACD
-    ind = ZerodhaIndicators(csv_file=csv_file)
-    ind.add_macd()
-    
-    df = ind.get_dataframe().tail(num_candles)
-    
-    # Create datetime column
-    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'].astype(str))
+    df = _recent_candles(data, num_candles)
     
     # Create figure with 2 subplots
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10), height_ratios=[2, 1])
     
     # Plot price
-    ax1.plot(df['DateTime'], df['close'], label='Close', linewidth=2, color='black')
+    ax1.plot(df.index, df['close'], label='Close', linewidth=2, color='black')
     ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
     ax1.set_title('Price Chart', fontsize=14, fontweight='bold')
@@ -148,9 +141,9 @@ def plot_macd(csv_file, num_candles=100):
     ax1.grid(True, alpha=0.3)
     
     # Plot MACD
-    ax2.plot(df['DateTime'], df['MACD'], label='MACD', linewidth=2, color='blue')
-    ax2.plot(df['DateTime'], df['MACD_Signal'], label='Signal', linewidth=2, color='red')
-    ax2.bar(df['DateTime'], df['MACD_Histogram'], label='Histogram', alpha=0.3, color='gray')
+    ax2.plot(df.index, df['MACD'], label='MACD', linewidth=2, color='blue')
+    ax2.plot(df.index, df['MACD_Signal'], label='Signal', linewidth=2, color='red')
+    ax2.bar(df.index, df['MACD_Histogram'], label='Histogram', alpha=0.3, color='gray')
     ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
     ax2.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
@@ -166,32 +159,25 @@ def plot_macd(csv_file, num_candles=100):
     plt.show()
 
 
-def plot_bollinger_bands(csv_file, num_candles=100):
+def plot_bollinger_bands(data, num_candles=100):
     """
     Plot Bollinger Bands
     
     Args:
-        csv_file (str): CSV file path
+        data (pd.DataFrame | ZerodhaIndicators): Data with Bollinger Band columns
         num_candles (int): Number of recent candles to plot
     """
-    # Load and add Bollinger Bands
-    ind = ZerodhaIndicators(csv_file=csv_file)
-    ind.add_bollinger_bands()
-    
-    df = ind.get_dataframe().tail(num_candles)
-    
-    # Create datetime column
-    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'].astype(str))
+    df = _recent_candles(data, num_candles)
     
     # Create figure
     fig, ax = plt.subplots(figsize=(15, 7))
     
     # Plot Bollinger Bands
-    ax.plot(df['DateTime'], df['close'], label='Close', linewidth=2, color='black')
-    ax.plot(df['DateTime'], df['BB_Upper'], label='Upper Band', linewidth=1.5, color='red', linestyle='--')
-    ax.plot(df['DateTime'], df['BB_Middle'], label='Middle Band (SMA)', linewidth=1.5, color='blue')
-    ax.plot(df['DateTime'], df['BB_Lower'], label='Lower Band', linewidth=1.5, color='green', linestyle='--')
-    ax.fill_between(df['DateTime'], df['BB_Upper'], df['BB_Lower'], alpha=0.1, color='gray')
+    ax.plot(df.index, df['close'], label='Close', linewidth=2, color='black')
+    ax.plot(df.index, df['BB_Upper'], label='Upper Band', linewidth=1.5, color='red', linestyle='--')
+    ax.plot(df.index, df['BB_Middle'], label='Middle Band (SMA)', linewidth=1.5, color='blue')
+    ax.plot(df.index, df['BB_Lower'], label='Lower Band', linewidth=1.5, color='green', linestyle='--')
+    ax.fill_between(df.index, df['BB_Upper'], df['BB_Lower'], alpha=0.1, color='gray')
     
     # Format x-axis
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
@@ -209,27 +195,15 @@ def plot_bollinger_bands(csv_file, num_candles=100):
     plt.show()
 
 
-def plot_complete_analysis(csv_file, num_candles=100):
+def plot_complete_analysis(data, num_candles=100):
     """
     Complete technical analysis with multiple indicators
     
     Args:
-        csv_file (str): CSV file path
+        data (pd.DataFrame | ZerodhaIndicators): Data with SMA_20, SMA_50, RSI_14, MACD, Bollinger and Volume_SMA_20 columns
         num_candles (int): Number of recent candles to plot
     """
-    # Load and add all indicators
-    ind = ZerodhaIndicators(csv_file=csv_file)
-    ind.add_sma(20)
-    ind.add_sma(50)
-    ind.add_rsi(14)
-    ind.add_macd()
-    ind.add_bollinger_bands()
-    ind.add_volume_sma(20)
-    
-    df = ind.get_dataframe().tail(num_candles)
-    
-    # Create datetime column
-    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'].astype(str))
+    df = _recent_candles(data, num_candles)
     
     # Create figure with 4 subplots
     fig = plt.figure(figsize=(16, 12))
@@ -241,13 +215,13 @@ def plot_complete_analysis(csv_file, num_candles=100):
     ax4 = fig.add_subplot(gs[3])  # MACD
     
     # 1. Price with Bollinger Bands and Moving Averages
-    ax1.plot(df['DateTime'], df['close'], label='Close', linewidth=2, color='black', zorder=5)
-    ax1.plot(df['DateTime'], df['BB_Upper'], label='BB Upper', linewidth=1, color='red', linestyle='--', alpha=0.5)
-    ax1.plot(df['DateTime'], df['BB_Middle'], label='BB Middle', linewidth=1, color='blue', alpha=0.5)
-    ax1.plot(df['DateTime'], df['BB_Lower'], label='BB Lower', linewidth=1, color='green', linestyle='--', alpha=0.5)
-    ax1.fill_between(df['DateTime'], df['BB_Upper'], df['BB_Lower'], alpha=0.1, color='gray')
-    ax1.plot(df['DateTime'], df['SMA_20'], label='SMA 20', linewidth=1.5, color='orange', alpha=0.7)
-    ax1.plot(df['DateTime'], df['SMA_50'], label='SMA 50', linewidth=1.5, color='purple', alpha=0.7)
+    ax1.plot(df.index, df['close'], label='Close', linewidth=2, color='black', zorder=5)
+    ax1.plot(df.index, df['BB_Upper'], label='BB Upper', linewidth=1, color='red', linestyle='--', alpha=0.5)
+    ax1.plot(df.index, df['BB_Middle'], label='BB Middle', linewidth=1, color='blue', alpha=0.5)
+    ax1.plot(df.index, df['BB_Lower'], label='BB Lower', linewidth=1, color='green', linestyle='--', alpha=0.5)
+    ax1.fill_between(df.index, df['BB_Upper'], df['BB_Lower'], alpha=0.1, color='gray')
+    ax1.plot(df.index, df['SMA_20'], label='SMA 20', linewidth=1.5, color='orange', alpha=0.7)
+    ax1.plot(df.index, df['SMA_50'], label='SMA 50', linewidth=1.5, color='purple', alpha=0.7)
     ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
     ax1.set_title('Complete Technical Analysis', fontsize=16, fontweight='bold')
@@ -256,10 +230,9 @@ def plot_complete_analysis(csv_file, num_candles=100):
     ax1.grid(True, alpha=0.3)
     
     # 2. Volume
-    colors = ['green' if df['close'].iloc[i] >= df['open'].iloc[i] else 'red' 
-              for i in range(len(df))]
-    ax2.bar(df['DateTime'], df['volume'], color=colors, alpha=0.5, width=0.0003)
-    ax2.plot(df['DateTime'], df['Volume_SMA_20'], label='Volume SMA 20', linewidth=1.5, color='blue')
+    colors = np.where(df['close'].to_numpy() >= df['open'].to_numpy(), 'green', 'red')
+    ax2.bar(df.index, df['volume'], color=colors, alpha=0.5, width=0.0003)
+    ax2.plot(df.index, df['Volume_SMA_20'], label='Volume SMA 20', linewidth=1.5, color='blue')
     ax2.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
     ax2.set_ylabel('Volume', fontsize=12)
@@ -267,10 +240,10 @@ def plot_complete_analysis(csv_file, num_candles=100):
     ax2.grid(True, alpha=0.3)
     
     # 3. RSI
-    ax3.plot(df['DateTime'], df['RSI_14'], label='RSI 14', linewidth=2, color='purple')
+    ax3.plot(df.index, df['RSI_14'], label='RSI 14', linewidth=2, color='purple')
     ax3.axhline(y=70, color='r', linestyle='--', linewidth=1, alpha=0.5)
     ax3.axhline(y=30, color='g', linestyle='--', linewidth=1, alpha=0.5)
-    ax3.fill_between(df['DateTime'], 30, 70, alpha=0.1, color='gray')
+    ax3.fill_between(df.index, 30, 70, alpha=0.1, color='gray')
     ax3.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45, ha='right')
     ax3.set_ylabel('RSI', fontsize=12)
@@ -279,10 +252,10 @@ def plot_complete_analysis(csv_file, num_candles=100):
     ax3.grid(True, alpha=0.3)
     
     # 4. MACD
-    ax4.plot(df['DateTime'], df['MACD'], label='MACD', linewidth=2, color='blue')
-    ax4.plot(df['DateTime'], df['MACD_Signal'], label='Signal', linewidth=2, color='red')
-    colors_macd = ['green' if val >= 0 else 'red' for val in df['MACD_Histogram']]
-    ax4.bar(df['DateTime'], df['MACD_Histogram'], alpha=0.3, color=colors_macd, width=0.0003)
+    ax4.plot(df.index, df['MACD'], label='MACD', linewidth=2, color='blue')
+    ax4.plot(df.index, df['MACD_Signal'], label='Signal', linewidth=2, color='red')
+    colors_macd = np.where(df['MACD_Histogram'].to_numpy() >= 0, 'green', 'red')
+    ax4.bar(df.index, df['MACD_Histogram'], alpha=0.3, color=colors_macd, width=0.0003)
     ax4.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
     ax4.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b %H:%M'))
     plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45, ha='right')
@@ -307,23 +280,28 @@ def main():
     print("="*60)
     
     try:
+        # Compute indicators once and share the same slice across charts
+        ind = ZerodhaIndicators(csv_file=csv_file)
+        ind.add_all_basic_indicators()
+        df = ind.get_dataframe().tail(num_candles)
+        
         print("\n📊 Generating charts...")
         
         # Generate individual charts
         print("\n1. Price with Moving Averages...")
-        plot_price_with_sma(csv_file, num_candles)
+        plot_price_with_sma(df, num_candles)
         
         print("\n2. RSI Chart...")
-        plot_rsi(csv_file, num_candles)
+        plot_rsi(df, num_candles)
         
         print("\n3. MACD Chart...")
-        plot_macd(csv_file, num_candles)
+        plot_macd(df, num_candles)
         
         print("\n4. Bollinger Bands...")
-        plot_bollinger_bands(csv_file, num_candles)
+        plot_bollinger_bands(df, num_candles)
         
         print("\n5. Complete Analysis...")
-        plot_complete_analysis(csv_file, num_candles)
+        plot_complete_analysis(df, num_candles)
         
         print("\n" + "="*60)
         print("✅ ALL CHARTS GENERATED SUCCESSFULLY!")
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 redirect_url = "https://localhost"
 
 base_url = "https://kite.zerodha.com"
@@ -8,4 +10,23 @@ instruments_url = "https://api.kite.trade/instruments"
 first_app_folder = "first_app"
 zerodha_token_file = f"{first_app_folder}/zerodha_tokens.json"
 historical_data_folder = f"{first_app_folder}/historical_data"
+
+# Local cache (instrument dumps, etc.)
+cache_folder = f"{Path.home()}/.cache/zerodha"
+instruments_cache_folder = f"{cache_folder}/instruments"
+instruments_cache_max_age = 6 * 60 * 60  # seconds
+historical_cache_folder = f"{cache_folder}/historical"
+chromedriver_path_cache = f"{cache_folder}/chromedriver.path"
+chromedriver_cache_max_age = 7 * 24 * 60 * 60  # seconds
+chrome_profile_folder = f"{cache_folder}/chrome-profile"
+
+# Kite API connection pool (shared by login and historical data)
+kite_pool_size = 16
+
+# Historical data download
+historical_chunk_days = 100
+historical_max_workers = 8
+historical_batch_workers = 16
+historical_requests_per_second = 3
+historical_rate_limit_retries = 3
      
@@ -0,0 +1,66 @@
+"""
+Shared test data and comparisons for the indicator tests
+"""
+
+import numpy as np
+import pandas as pd
+
+ALL_INDICATORS = [
+    ('add_sma', (20,)), ('add_ema', (20,)), ('add_wma', (20,)), ('add_rsi', (14,)), ('add_macd', ()),
+    ('add_bollinger_bands', ()), ('add_atr', ()), ('add_stochastic', ()), ('add_adx', ()),
+    ('add_volume_sma', ()), ('add_obv', ()), ('add_pivot_points', ()), ('add_candlestick_patterns', ()),
+]
+
+# Rolling std of ~1000 prices loses ~1e-7 to cancellation on near-flat windows
+# (pandas' own rolling std included), so std-based columns get an absolute tolerance
+STD_COLUMNS = {'BB_Upper', 'BB_Lower', 'BB_Width'}
+
+
+def make_ohlcv(n_bars=1500, seed=0):
+    """
+    Seeded two-decimal OHLCV frame with flat stretches and missing prices
+    
+    Args:
+        n_bars (int): Number of 5 minute bars
+        seed (int): Random seed
+        
+    Returns:
+        pd.DataFrame: Date, Time, open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+    close = 1000 + np.cumsum(rng.normal(0, 2, n_bars)).round(2)
+    open_ = (close + rng.normal(0, 1, n_bars)).round(2)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 1, n_bars)).round(2)
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 1, n_bars)).round(2)
+    volume = rng.integers(100, 10000, n_bars)
+    
+    # Flat stretch: zero gains/losses, zero ranges and zero-width bands
+    open_[300:340] = high[300:340] = low[300:340] = close[300:340] = close[299]
+    # Flat closes only, so RSI sees an all-zero window while ranges are not
+    close[600:630] = close[599]
+    
+    # Missing prices
+    close[500] = np.nan
+    high[700] = np.nan
+    low[900:905] = np.nan
+    
+    timestamps = pd.date_range('2025-01-01 09:15', periods=n_bars, freq='5min')
+    return pd.DataFrame({
+        'Date': timestamps.strftime('%d-%m-%Y'),
+        'Time': timestamps.strftime('%H:%M:%S'),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+    })
+
+
+def assert_columns_match(expected, actual, columns):
+    """Compare indicator columns, treating NaN in the same place as equal"""
+    for col in columns:
+        np.testing.assert_allclose(
+            actual[col].to_numpy(dtype=np.float64),
+            expected[col].to_numpy(dtype=np.float64),
+            rtol=1e-9, atol=1e-6 if col in STD_COLUMNS else 1e-9, err_msg=col
+        )
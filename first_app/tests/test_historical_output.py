@@ -0,0 +1,105 @@
+"""
+Checks on the files written by ZerodhaHistoricalData, using a fake Kite client
+
+Importing the downloader needs first_app/zerodha_config.py, so these tests
+are skipped on a checkout without one.
+
+    python -m pytest first_app/tests
+"""
+
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from first_app.code_files.indicators import ZerodhaIndicators
+
+hdd = pytest.importorskip(
+    'first_app.code_files.historical_data_download',
+    reason="needs first_app/zerodha_config.py"
+)
+
+IST = dt.timezone(dt.timedelta(hours=5, minutes=30))
+
+
+class FakeKite:
+    """Serves seeded 5 minute candles on a 0.05 tick for any date range"""
+    
+    def instruments(self, exchange):
+        return [{'instrument_token': 1, 'tradingsymbol': 'TEST', 'exchange': exchange}]
+    
+    def historical_data(self, instrument_token, from_date, to_date, interval):
+        candles = []
+        day = from_date
+        while day <= to_date:
+            rng = np.random.default_rng(day.toordinal())
+            close = 100 + np.cumsum(rng.integers(-3, 4, 75)) * 0.05
+            open_ = close + rng.integers(-2, 3, 75) * 0.05
+            high = np.maximum(open_, close) + rng.integers(0, 3, 75) * 0.05
+            low = np.minimum(open_, close) - rng.integers(0, 3, 75) * 0.05
+            for bar in range(75):
+                candles.append({
+                    'date': dt.datetime.combine(day, dt.time(9, 15), IST) + dt.timedelta(minutes=5 * bar),
+                    'open': round(open_[bar], 2),
+                    'high': round(high[bar], 2),
+                    'low': round(low[bar], 2),
+                    'close': round(close[bar], 2),
+                    'volume': int(rng.integers(100, 10000)),
+                })
+            day += dt.timedelta(1)
+        return candles
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    """ZerodhaHistoricalData on a FakeKite, with the local caches under tmp_path"""
+    monkeypatch.setattr(hdd, 'historical_cache_folder', str(tmp_path / 'cache'))
+    monkeypatch.setattr(hdd, 'instruments_cache_folder', str(tmp_path / 'instruments'))
+    return hdd.ZerodhaHistoricalData(kite=FakeKite())
+
+
+def test_csv_and_parquet_give_identical_indicators(downloader, tmp_path):
+    inception_date = (dt.date.today() - dt.timedelta(40)).strftime('%d-%m-%Y')
+    results = {}
+    for suffix in ('csv', 'parquet'):
+        output_file = str(tmp_path / f"TEST.{suffix}")
+        downloader.fetch_ohlc('TEST', inception_date, '5minute', output_file=output_file,
+                              return_data=False, instrument_token=1)
+        
+        reader = {'csv': 'csv_file', 'parquet': 'parquet_file'}[suffix]
+        indicators = ZerodhaIndicators(**{reader: output_file})
+        indicators.add_all_basic_indicators().add_adx().add_candlestick_patterns()
+        results[suffix] = indicators.df
+    
+    csv_df, parquet_df = results['csv'], results['parquet']
+    assert len(csv_df) == len(parquet_df) > 0
+    for col in csv_df.columns.drop(['Date', 'Time']):
+        np.testing.assert_array_equal(
+            parquet_df[col].to_numpy(dtype=np.float64),
+            csv_df[col].to_numpy(dtype=np.float64),
+            err_msg=col
+        )
+
+
+class FailingKite(FakeKite):
+    """FakeKite whose last chunk (the one ending today) fails"""
+    
+    def historical_data(self, instrument_token, from_date, to_date, interval):
+        if to_date >= dt.date.today():
+            raise RuntimeError("download failed")
+        return super().historical_data(instrument_token, from_date, to_date, interval)
+
+
+@pytest.mark.parametrize('suffix', ['csv', 'parquet'])
+def test_failed_download_keeps_previous_file(downloader, tmp_path, suffix):
+    output_file = tmp_path / f"TEST.{suffix}"
+    output_file.write_text("previous download")
+    downloader.kite = FailingKite()
+    
+    inception_date = (dt.date.today() - dt.timedelta(250)).strftime('%d-%m-%Y')
+    with pytest.raises(RuntimeError):
+        downloader.fetch_ohlc('TEST', inception_date, '5minute', output_file=str(output_file),
+                              return_data=False, instrument_token=1)
+    
+    assert output_file.read_text() == "previous download"
+    assert list(tmp_path.glob('*.tmp')) == []
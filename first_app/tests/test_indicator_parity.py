@@ -0,0 +1,72 @@
+"""
+Parity checks: every compute path must reproduce the pandas engine
+
+Run from the repository root:
+
+    python -m pytest first_app/tests
+"""
+
+import pytest
+
+from first_app.code_files import indicators
+from first_app.code_files.indicators import BASIC_COLUMNS, NUMBA_AVAILABLE, ZerodhaIndicators
+from first_app.tests.helpers import ALL_INDICATORS, assert_columns_match, make_ohlcv
+
+CYTHON_AVAILABLE = indicators._indicators_core is not None
+
+ENGINES = [
+    pytest.param('numba', marks=pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")),
+    pytest.param('cython', marks=pytest.mark.skipif(not CYTHON_AVAILABLE, reason="Cython kernels not built")),
+]
+
+requires_numba = pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+
+
+# ==========================================
+# Helpers
+# ==========================================
+
+def pandas_basic_indicators(df):
+    """add_all_basic_indicators with the pandas engine"""
+    return ZerodhaIndicators(dataframe=df).add_all_basic_indicators().df
+
+
+# ==========================================
+# Tests
+# ==========================================
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engine_matches_pandas(engine):
+    df = make_ohlcv()
+    expected = ZerodhaIndicators(dataframe=df)
+    actual = ZerodhaIndicators(dataframe=df, engine=engine)
+    for name, args in ALL_INDICATORS:
+        getattr(expected, name)(*args)
+        getattr(actual, name)(*args)
+    
+    assert list(actual.df.columns) == list(expected.df.columns)
+    assert_columns_match(expected.df, actual.df, expected.df.columns[len(df.columns):])
+
+
+@requires_numba
+def test_fast_basic_indicators_match_pandas():
+    df = make_ohlcv()
+    actual = ZerodhaIndicators(dataframe=df).add_all_basic_indicators(fast=True).df
+    assert_columns_match(pandas_basic_indicators(df), actual, BASIC_COLUMNS)
+
+
+@requires_numba
+def test_from_panel_matches_pandas():
+    df = make_ohlcv()
+    frames = {
+        'FULL': df,
+        'HEAD': df.iloc[:700].reset_index(drop=True),
+        'TAIL': df.iloc[250:].reset_index(drop=True),
+        'SHORT': df.iloc[:5].reset_index(drop=True),
+    }
+    panel = ZerodhaIndicators.from_panel(frames)
+    
+    assert list(panel) == list(frames)
+    for ticker, frame in frames.items():
+        assert len(panel[ticker].df) == len(frame)
+        assert_columns_match(pandas_basic_indicators(frame), panel[ticker].df, BASIC_COLUMNS)
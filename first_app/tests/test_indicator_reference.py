@@ -0,0 +1,150 @@
+"""
+Reference checks: the pandas engine must reproduce the original pandas formulas
+
+The reference below is the straightforward rolling()/ewm()/loop version each
+indicator was first written as. Only pandas and numpy are needed, so these
+run without numba, bottleneck or the Cython kernels.
+
+    python -m pytest first_app/tests
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from first_app.code_files import indicators
+from first_app.code_files.indicators import ZerodhaIndicators
+from first_app.tests.helpers import ALL_INDICATORS, assert_columns_match, make_ohlcv
+
+
+def reference_indicators(df):
+    """
+    Every indicator in ALL_INDICATORS, computed the original way
+    
+    Args:
+        df (pd.DataFrame): OHLCV data
+        
+    Returns:
+        pd.DataFrame: Indicator columns
+    """
+    open_, high, low, close, volume = (df[col] for col in ('open', 'high', 'low', 'close', 'volume'))
+    ref = pd.DataFrame(index=df.index)
+    
+    # Moving averages
+    ref['SMA_20'] = close.rolling(window=20).mean()
+    ref['EMA_20'] = close.ewm(span=20, adjust=False).mean()
+    weights = np.arange(1, 21)
+    ref['WMA_20'] = close.rolling(window=20).apply(lambda prices: np.dot(prices, weights) / weights.sum(), raw=True)
+    
+    # RSI
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    ref['RSI_14'] = 100 - (100 / (1 + gain / loss))
+    
+    # MACD
+    ref['MACD'] = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    ref['MACD_Signal'] = ref['MACD'].ewm(span=9, adjust=False).mean()
+    ref['MACD_Histogram'] = ref['MACD'] - ref['MACD_Signal']
+    
+    # Bollinger Bands
+    ref['BB_Middle'] = close.rolling(window=20).mean()
+    rolling_std = close.rolling(window=20).std()
+    ref['BB_Upper'] = ref['BB_Middle'] + rolling_std * 2
+    ref['BB_Lower'] = ref['BB_Middle'] - rolling_std * 2
+    ref['BB_Width'] = ref['BB_Upper'] - ref['BB_Lower']
+    
+    # ATR
+    true_range = pd.concat([
+        high - low,
+        np.abs(high - close.shift()),
+        np.abs(low - close.shift()),
+    ], axis=1).max(axis=1)
+    atr = true_range.rolling(window=14).mean()
+    ref['ATR_14'] = atr
+    
+    # Stochastic
+    lowest_low = low.rolling(window=14).min()
+    highest_high = high.rolling(window=14).max()
+    ref['Stoch_K'] = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    ref['Stoch_D'] = ref['Stoch_K'].rolling(window=3).mean()
+    
+    # ADX
+    high_diff = high.diff()
+    low_diff = -low.diff()
+    plus_dm = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0)
+    minus_dm = low_diff.where((low_diff > high_diff) & (low_diff > 0), 0)
+    plus_di = 100 * (plus_dm.rolling(window=14).mean() / atr)
+    minus_di = 100 * (minus_dm.rolling(window=14).mean() / atr)
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    ref['ADX'] = dx.rolling(window=14).mean()
+    ref['Plus_DI'] = plus_di
+    ref['Minus_DI'] = minus_di
+    
+    # Volume
+    ref['Volume_SMA_20'] = volume.rolling(window=20).mean()
+    obv = [0]
+    for i in range(1, len(df)):
+        if close.iloc[i] > close.iloc[i - 1]:
+            obv.append(obv[-1] + volume.iloc[i])
+        elif close.iloc[i] < close.iloc[i - 1]:
+            obv.append(obv[-1] - volume.iloc[i])
+        else:
+            obv.append(obv[-1])
+    ref['OBV'] = obv
+    
+    # Pivot points
+    ref['Pivot'] = (high + low + close) / 3
+    ref['R1'] = 2 * ref['Pivot'] - low
+    ref['S1'] = 2 * ref['Pivot'] - high
+    ref['R2'] = ref['Pivot'] + (high - low)
+    ref['S2'] = ref['Pivot'] - (high - low)
+    
+    # Candlestick patterns
+    body = abs(close - open_)
+    ref['Doji'] = (body / (high - low) < 0.1).astype(int)
+    lower_shadow = df[['open', 'close']].min(axis=1) - low
+    upper_shadow = high - df[['open', 'close']].max(axis=1)
+    ref['Hammer'] = ((lower_shadow > 2 * body) & (upper_shadow < body)).astype(int)
+    prev_close = close.shift(1)
+    prev_open = open_.shift(1)
+    ref['Bullish_Engulfing'] = (
+        (close > open_) &
+        (prev_close < prev_open) &
+        (open_ < prev_close) &
+        (close > prev_open)
+    ).astype(int)
+    
+    return ref
+
+
+@pytest.mark.parametrize('use_bottleneck', [
+    pytest.param(True, marks=pytest.mark.skipif(indicators.bn is None, reason="bottleneck not installed")),
+    False,
+])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_pandas_engine_matches_reference(seed, use_bottleneck, monkeypatch):
+    if not use_bottleneck:
+        monkeypatch.setattr(indicators, 'bn', None)
+    
+    df = make_ohlcv(seed=seed)
+    actual = ZerodhaIndicators(dataframe=df)
+    for name, args in ALL_INDICATORS:
+        getattr(actual, name)(*args)
+    expected = reference_indicators(df)
+    
+    assert list(actual.df.columns[len(df.columns):]) == list(expected.columns)
+    assert_columns_match(expected, actual.df, expected.columns)
+
+
+def test_edited_column_is_recomputed():
+    df = make_ohlcv()
+    actual = ZerodhaIndicators(dataframe=df).add_sma(20).add_ema(12).add_ema(26).add_macd()
+    
+    # Memoized SMA/EMA results must not survive a change to their source column
+    actual.df['close'] = actual.df['close'] * 2
+    actual.add_sma(20).add_macd().add_bollinger_bands()
+    expected = reference_indicators(actual.df[df.columns])
+    
+    columns = ['SMA_20', 'MACD', 'MACD_Signal', 'MACD_Histogram', 'BB_Middle', 'BB_Upper', 'BB_Lower']
+    assert_columns_match(expected, actual.df, columns)
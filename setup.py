@@ -0,0 +1,22 @@
+"""
+Builds the optional compiled indicator kernels (engine='cython') in place:
+
+    pip install Cython
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        'first_app.code_files._indicators_core',
+        ['first_app/code_files/_indicators_core.pyx'],
+        extra_compile_args=['-O3'],
+    ),
+]
+
+setup(
+    name='zerodha-indicators-core',
+    ext_modules=cythonize(extensions),
+)